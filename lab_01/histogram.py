@@ -0,0 +1,153 @@
+# histogram.py
+# Wersja źródłowa - lab_02/histogram.py jest jej kopią (laboratoria są uruchamiane osobno,
+# bez wspólnego pakietu), więc zmiany wprowadza się tutaj i przenosi do lab_02 bez modyfikacji
+
+import hashlib
+import json
+import os
+
+from PIL import Image
+
+# Histogramy zapamiętane według skrótu SHA-256 zawartości pliku lub obrazu
+HISTOGRAM_CACHE = {}
+
+CHUNK_SIZE = 1 << 20
+
+
+def to_gray(image):
+    # Tak samo jak binary_threshold(): progowanie dotyczy obrazu w odcieniach szarości
+    if not isinstance(image, Image.Image):
+        image = Image.fromarray(image)
+    return image.convert('L')
+
+
+def compute_histogram(image):
+    # 256 przedziałów liczonych w jednym przebiegu po pikselach
+    return to_gray(image).histogram()
+
+
+def file_hash(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def image_hash(image):
+    if isinstance(image, Image.Image):
+        header = f"{image.mode}{image.size}"
+    else:
+        header = f"{image.dtype}{image.shape}"
+    return hashlib.sha256(header.encode() + image.tobytes()).hexdigest()
+
+
+def cached_histogram(key, compute, cache_dir=None):
+    if key in HISTOGRAM_CACHE:
+        return HISTOGRAM_CACHE[key]
+
+    cache_path = os.path.join(cache_dir, f"{key}.json") if cache_dir else None
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path) as file:
+            histogram = json.load(file)
+    else:
+        histogram = compute()
+        if cache_path:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(cache_path, 'w') as file:
+                json.dump(histogram, file)
+
+    HISTOGRAM_CACHE[key] = histogram
+    return histogram
+
+
+def histogram_for_file(file_path, cache_dir=None):
+    return cached_histogram(file_hash(file_path), lambda: compute_histogram(Image.open(file_path)), cache_dir)
+
+
+def histogram_for_image(image, cache_dir=None):
+    return cached_histogram(image_hash(image), lambda: compute_histogram(image), cache_dir)
+
+
+# Wszystkie progi poniżej to poziomy jasności: piksel > poziom staje się biały (255)
+
+def otsu_threshold(histogram):
+    # Poziom maksymalizujący wariancję międzyklasową
+    total = sum(histogram)
+    sum_all = sum(level * count for level, count in enumerate(histogram))
+    weight_background = 0
+    sum_background = 0
+    best_level, best_variance = 0, -1.0
+
+    for level in range(256):
+        weight_background += histogram[level]
+        if weight_background == 0:
+            continue
+        weight_foreground = total - weight_background
+        if weight_foreground == 0:
+            break
+
+        sum_background += level * histogram[level]
+        mean_background = sum_background / weight_background
+        mean_foreground = (sum_all - sum_background) / weight_foreground
+        variance = weight_background * weight_foreground * (mean_background - mean_foreground) ** 2
+        if variance > best_variance:
+            best_level, best_variance = level, variance
+    return best_level
+
+
+def percentile_threshold(histogram, percent):
+    # Najniższy poziom, do którego (włącznie) należy co najmniej percent % pikseli
+    limit = percent / 100.0 * sum(histogram)
+    cumulative = 0
+    for level, count in enumerate(histogram):
+        cumulative += count
+        if cumulative >= limit:
+            return level
+    return 255
+
+
+def mean_threshold(histogram):
+    # Pusty obraz lub kafelek daje poziom 0, tak jak otsu_threshold() i percentile_threshold()
+    total = sum(histogram)
+    if total == 0:
+        return 0
+    return int(sum(level * count for level, count in enumerate(histogram)) / total)
+
+
+def auto_threshold(histogram, method="otsu"):
+    # method: "otsu", "mean" albo "pNN" (percentyl NN, np. "p90")
+    if method == "otsu":
+        return otsu_threshold(histogram)
+    elif method == "mean":
+        return mean_threshold(histogram)
+    elif method.startswith("p"):
+        return percentile_threshold(histogram, float(method[1:]))
+    raise ValueError(f"Nieznana metoda progowania: {method}")
+
+
+def threshold_percent_for_level(level):
+    # binary_threshold() porównuje p > percent / 100 * 256; środek między poziomami daje p > level
+    return (level + 0.5) / 256 * 100
+
+
+def white_fractions(histogram, levels):
+    # Udział białych pikseli dla wielu progów naraz - z jednego histogramu, bez ponownego czytania obrazu
+    total = sum(histogram)
+    cumulative = []
+    running = 0
+    for count in histogram:
+        running += count
+        cumulative.append(running)
+    return {level: (total - cumulative[level]) / total for level in levels}
+
+
+def multi_threshold_lut(levels):
+    # Kilka progów naraz: k progów dzieli jasności na k + 1 równomiernie rozłożonych odcieni
+    levels = sorted(levels)
+    step = 255 / len(levels)
+    lut = []
+    for p in range(256):
+        band = sum(1 for level in levels if p > level)
+        lut.append(round(band * step))
+    return lut
@@ -1,5 +1,19 @@
+import argparse
+import glob
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
 from PIL import Image, ImageEnhance
 
+from histogram import auto_threshold, histogram_for_file, histogram_for_image, threshold_percent_for_level
+
+# Obraz 1x256 zawierający każdą jasność raz - przepuszczony przez operację daje jej tablicę LUT
+GRADIENT = Image.frombytes('L', (256, 1), bytes(range(256)))
+
+IMAGE_EXTENSIONS = ('.bmp', '.png', '.jpg', '.jpeg', '.tif', '.tiff')
+
 def load_image(file_path):
     image = Image.open(file_path).convert('L')
     return image
@@ -20,10 +34,102 @@ def brighten_image(image, percent):
     return img_enhanced
 
 def binary_threshold(image, threshold_percent=50):
-    threshold = threshold_percent / 100.0 * 256
-    binary_image = image.point(lambda p: 255 if p > threshold else 0)
+    # Zamiast procentu można podać metodę automatyczną: "otsu", "mean" lub "pNN"
+    if isinstance(threshold_percent, str):
+        level = auto_threshold(histogram_for_image(image), threshold_percent)
+        threshold_percent = threshold_percent_for_level(level)
+    binary_image = image.point(threshold_lut(threshold_percent))
     return binary_image
 
+def darken_lut(percent):
+    return list(darken_image(GRADIENT, percent).tobytes())
+
+def brighten_lut(percent):
+    return list(brighten_image(GRADIENT, percent).tobytes())
+
+def threshold_lut(threshold_percent=50):
+    threshold = threshold_percent / 100.0 * 256
+    return [255 if p > threshold else 0 for p in range(256)]
+
+def build_operations(darken_values, brighten_value, steps, thresholds):
+    # Nazwy plików jak w trybie interaktywnym, każda operacja jako gotowa tablica 256 wartości
+    operations = []
+    for value in darken_values:
+        operations.append((f'darkened_image_by_{value}%', darken_lut(value)))
+    if brighten_value is not None:
+        for i in range(steps):
+            operations.append((f'brightened_image_step_{i + 1}', brighten_lut(brighten_value * (i + 1))))
+    for value in thresholds:
+        operations.append((f'binary_image_{value}%', threshold_lut(value)))
+    return operations
+
+def find_images(patterns):
+    # Każdy argument może być katalogiem albo wzorcem glob; plik pasujący do kilku argumentów
+    # (np. maps/ i maps/*.bmp) jest przetwarzany raz
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, '*')
+        paths += [os.path.abspath(path) for path in sorted(glob.glob(pattern))
+                  if path.lower().endswith(IMAGE_EXTENSIONS)]
+    return list(dict.fromkeys(paths))
+
+def output_names(paths, output_dir):
+    # Struktura katalogów wejściowych (względem wspólnego katalogu) odtworzona w output_dir, więc pliki
+    # o tej samej nazwie z różnych katalogów nie nadpisują swoich wyników; m.bmp i m.png z jednego
+    # katalogu dostają prefiks z rozszerzeniem
+    if not paths:
+        return []
+    root = os.path.commonpath([os.path.dirname(path) for path in paths])
+    stems = [os.path.splitext(path)[0] for path in paths]
+    stem_counts = Counter(stems)
+    names = []
+    for path, stem in zip(paths, stems):
+        directory = os.path.join(output_dir, os.path.relpath(os.path.dirname(path), root))
+        name = os.path.basename(stem) if stem_counts[stem] == 1 else os.path.basename(path).replace('.', '_')
+        names.append((os.path.normpath(directory), name))
+    return names
+
+def auto_threshold_operations(file_path, methods, cache_dir=None):
+    # Progi automatyczne zależą od obrazu - wszystkie wyznaczane z jednego histogramu (z pamięci podręcznej)
+    if not methods:
+        return []
+    histogram = histogram_for_file(file_path, cache_dir)
+    operations = []
+    for method in methods:
+        level = auto_threshold(histogram, method)
+        operations.append((f'binary_image_{method}', threshold_lut(threshold_percent_for_level(level))))
+    return operations
+
+def process_file(file_path, operations, output_name, auto_methods=(), cache_dir=None):
+    # Zwraca ścieżki faktycznie zapisanych plików
+    output_dir, name = output_name
+    os.makedirs(output_dir, exist_ok=True)
+    image = load_image(file_path)
+    written = []
+    for suffix, lut in operations + auto_threshold_operations(file_path, auto_methods, cache_dir):
+        output_path = os.path.join(output_dir, f'{name}_{suffix}.bmp')
+        save_image(image.point(lut), output_path)
+        written.append(output_path)
+    return file_path, written
+
+def run_batch(patterns, operations, output_dir, workers=None, auto_methods=(), cache_dir=None):
+    # Zwraca listę zapisanych plików (bez powtórzeń)
+    os.makedirs(output_dir, exist_ok=True)
+    paths = find_images(patterns)
+    count = len(paths)
+    written = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for file_path, outputs in executor.map(process_file, paths, [operations] * count,
+                                               output_names(paths, output_dir), [auto_methods] * count,
+                                               [cache_dir] * count):
+            written.update(dict.fromkeys(outputs))
+            print(f"Przetworzono {file_path}")
+    return list(written)
+
+def parse_values(text):
+    return [int(value) for value in text.split(',')] if text else []
+
 def main():
     image = load_image('Mapa_MD_no_terrain_low_res_Gray.bmp')
 
@@ -57,5 +163,27 @@ def main():
     else:
         print("Podano złą wartość\n")
 
+def batch_main():
+    parser = argparse.ArgumentParser(description="Wsadowe przetwarzanie obrazów tablicami LUT")
+    parser.add_argument('inputs', nargs='+', help="katalogi lub wzorce glob z obrazami")
+    parser.add_argument('--darken', type=parse_values, default=[], help="np. 25,70")
+    parser.add_argument('--brighten', type=int, help="krok rozjaśnienia w %%")
+    parser.add_argument('--steps', type=int, default=3)
+    parser.add_argument('--threshold', type=parse_values, default=[], help="np. 50,60")
+    parser.add_argument('--auto-threshold', type=lambda text: text.split(','), default=[],
+                        help="np. otsu,mean,p90")
+    parser.add_argument('--histogram-cache', help="katalog pamięci podręcznej histogramów")
+    parser.add_argument('--output', default='batch_output')
+    parser.add_argument('--workers', type=int)
+    args = parser.parse_args()
+
+    operations = build_operations(args.darken, args.brighten, args.steps, args.threshold)
+    written = run_batch(args.inputs, operations, args.output, args.workers, args.auto_threshold, args.histogram_cache)
+    print(f"Zapisano {len(written)} obrazów w katalogu '{args.output}'.")
+
 if __name__ == "__main__":
-    main()
+    # Bez argumentów - dotychczasowy tryb interaktywny
+    if len(sys.argv) > 1:
+        batch_main()
+    else:
+        main()
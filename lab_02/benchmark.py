@@ -0,0 +1,207 @@
+# benchmark.py
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from convolution_backends import constant_value_of, separate_kernel
+from main import binary_threshold, convolution, dilatation, erosion
+
+# Bez pakietu numba method="numba" liczy wersją NumPy - nie jest wtedy mierzony osobno
+NUMBA_METHODS = ["numba"] if importlib.util.find_spec("numba") is not None else []
+MORPHOLOGY_METHODS = ["numpy", "van_herk", "packed"] + NUMBA_METHODS
+CONVOLUTION_METHODS = ["auto", "direct", "separable", "fft", "box"] + NUMBA_METHODS
+BORDER_TYPES = ["constant", "replicate", "reflect", "wrap"]
+# Wynik splotu jest obcinany do uint8, więc różnice zaokrągleń mogą dać różnicę o 1
+CONVOLUTION_TOLERANCE = 1
+# Wzorce dla obrazów większych niż --reference-max-pixels, na których wersja "python" trwałaby zbyt długo
+FAST_REFERENCE = {"morphology": "numpy", "convolution": "direct"}
+
+
+def binomial_kernel(size):
+    # Maska separowalna, jak gauss.txt (dla size = 5 identyczna)
+    row = np.array([1.0])
+    for _ in range(size - 1):
+        row = np.convolve(row, [1.0, 1.0])
+    return np.outer(row, row)
+
+
+def random_kernel(size, rng):
+    return rng.integers(-4, 10, size=(size, size)).astype(np.float64)
+
+
+def quiet(function, *args, **kwargs):
+    # convolution() wypisuje sumę maski - w benchmarku tylko by przeszkadzała
+    with contextlib.redirect_stdout(io.StringIO()):
+        return function(*args, **kwargs)
+
+
+def measure(function, repeats):
+    # Najlepszy z kilku czasów oraz szczyt pamięci (tracemalloc widzi alokacje NumPy, ale nie numba)
+    quiet(function)
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = quiet(function)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    quiet(function)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, best, peak
+
+
+def compare(result, reference, tolerance):
+    if reference is None:
+        return None, None
+    difference = int(np.abs(result.astype(np.int16) - reference.astype(np.int16)).max())
+    return difference <= tolerance, difference
+
+
+def reference_result(function, fast_method, reference_max_pixels, rows, cols):
+    # Wzorcem jest implementacja "python", a dla dużych obrazów prosta wersja wektorowa fast_method - tak
+    # błędy kafelkowania, pakowania czy podziału na pasy wierszy są wykrywane także przy dużych rozmiarach.
+    # Zwraca (wynik wzorca, nazwa wzorca, uwaga)
+    method = "python" if rows * cols <= reference_max_pixels else fast_method
+    try:
+        return quiet(function, method), method, None
+    except Exception as error:
+        return None, method, f"{type(error).__name__}: {error}"
+
+
+def record(operation, method, image, parameter, border_type, seconds, peak, match, difference, note=None,
+           reference=None):
+    rows, cols = image.shape[:2]
+    return {
+        "operation": operation,
+        "method": method,
+        "rows": rows,
+        "cols": cols,
+        "channels": 1 if image.ndim == 2 else image.shape[2],
+        "parameter": parameter,
+        "border_type": border_type,
+        "seconds": seconds,
+        "megapixels_per_s": rows * cols / seconds / 1e6 if seconds > 0 else None,
+        "peak_bytes": peak,
+        "match": match,
+        "max_abs_diff": difference,
+        "reference": reference,
+        "note": note,
+    }
+
+
+def benchmark_morphology(sizes, radii, border_types, repeats, reference_max_pixels, rng):
+    for rows, cols in sizes:
+        image = np.where(rng.random((rows, cols)) < 0.5, 255, 0).astype(np.uint8)
+        for radius in radii:
+            for border_type in border_types:
+                for operation, function in (("dilatation", dilatation), ("erosion", erosion)):
+                    reference, reference_method, note = reference_result(
+                        lambda method: function(image, radius, border_type, method=method),
+                        FAST_REFERENCE["morphology"], reference_max_pixels, rows, cols)
+                    methods = MORPHOLOGY_METHODS + (["python"] if reference_method == "python" else [])
+                    for method in methods:
+                        result, seconds, peak = measure(lambda: function(image, radius, border_type, method=method),
+                                                        repeats)
+                        match, difference = compare(result, reference, 0)
+                        yield record(operation, method, image, radius, border_type, seconds, peak,
+                                     match, difference, note, reference_method)
+
+
+def benchmark_convolution(sizes, kernel_sizes, border_types, channel_counts, repeats, reference_max_pixels, rng):
+    for rows, cols in sizes:
+        for channels in channel_counts:
+            shape = (rows, cols) if channels == 1 else (rows, cols, channels)
+            image = rng.integers(0, 256, size=shape).astype(np.uint8)
+            for size in kernel_sizes:
+                kernels = {f"binomial_{size}": binomial_kernel(size), f"random_{size}": random_kernel(size, rng),
+                           f"box_{size}": np.ones((size, size))}
+                for name, kernel in kernels.items():
+                    for border_type in border_types:
+                        reference, reference_method, note = reference_result(
+                            lambda method: convolution(image, kernel.copy(), border_type, method=method),
+                            FAST_REFERENCE["convolution"], reference_max_pixels, rows, cols)
+                        methods = CONVOLUTION_METHODS + (["python"] if reference_method == "python" else [])
+                        for method in methods:
+                            if method == "separable" and separate_kernel(kernel) is None:
+                                continue
+                            if method == "box" and constant_value_of(kernel) is None:
+                                continue
+                            result, seconds, peak = measure(
+                                lambda: convolution(image, kernel.copy(), border_type, method=method), repeats)
+                            match, difference = compare(result, reference, CONVOLUTION_TOLERANCE)
+                            yield record("convolution", method, image, name, border_type, seconds, peak,
+                                         match, difference, note, reference_method)
+
+
+def benchmark_threshold(sizes, channel_counts, repeats, rng):
+    # binary_threshold() ma jedną implementację (tablica LUT w PIL) - mierzona jest tylko przepustowość
+    for rows, cols in sizes:
+        for channels in channel_counts:
+            shape = (rows, cols) if channels == 1 else (rows, cols, channels)
+            image = rng.integers(0, 256, size=shape).astype(np.uint8)
+            _, seconds, peak = measure(lambda: binary_threshold(image, 50), repeats)
+            yield record("binary_threshold", "pil", image, 50, None, seconds, peak, None, None)
+
+
+def parse_sizes(text):
+    return [tuple(int(value) for value in size.split("x")) for size in text.split(",")]
+
+
+def parse_ints(text):
+    return [int(value) for value in text.split(",")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark i test zgodności operacji z lab_02")
+    parser.add_argument("--sizes", type=parse_sizes, default=parse_sizes("64x64,512x512,2048x2048"))
+    parser.add_argument("--radii", type=parse_ints, default=parse_ints("1,3,8"))
+    parser.add_argument("--kernel-sizes", type=parse_ints, default=parse_ints("3,5,9"))
+    parser.add_argument("--channels", type=parse_ints, default=parse_ints("1,3"))
+    parser.add_argument("--border-types", type=lambda text: text.split(","), default=BORDER_TYPES)
+    parser.add_argument("--operations", type=lambda text: text.split(","),
+                        default=["dilatation_erosion", "convolution", "binary_threshold"])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--reference-max-pixels", type=int, default=64 * 64)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="plik wynikowy JSON Lines (domyślnie standardowe wyjście)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    runs = []
+    if "dilatation_erosion" in args.operations:
+        runs.append(benchmark_morphology(args.sizes, args.radii, args.border_types, args.repeats,
+                                         args.reference_max_pixels, rng))
+    if "convolution" in args.operations:
+        runs.append(benchmark_convolution(args.sizes, args.kernel_sizes, args.border_types, args.channels,
+                                          args.repeats, args.reference_max_pixels, rng))
+    if "binary_threshold" in args.operations:
+        runs.append(benchmark_threshold(args.sizes, args.channels, args.repeats, rng))
+
+    output = open(args.output, "w") if args.output else sys.stdout
+    failures = 0
+    try:
+        for run in runs:
+            for result in run:
+                failures += result["match"] is False
+                output.write(json.dumps(result) + "\n")
+                output.flush()
+    finally:
+        if args.output:
+            output.close()
+
+    if failures:
+        print(f"Niezgodnych wyników: {failures}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# binary_packed.py
+
+import numpy as np
+
+from morphology import is_binary, split_radius
+from padding import border_indices, pad_image
+
+
+def packed_length(bits):
+    return (bits + 7) // 8
+
+
+def shift_bits_left(packed, shift):
+    # Przesunięcie strumienia bitów w każdym wierszu o shift pikseli w lewo (piksel j + shift trafia na j);
+    # z prawej strony wchodzą zera
+    whole, part = divmod(shift, 8)
+    result = np.zeros_like(packed)
+    if whole >= packed.shape[1]:
+        return result
+
+    source = packed[:, whole:]
+    result[:, :source.shape[1]] = source << part
+    if part:
+        result[:, :source.shape[1] - 1] |= source[:, 1:] >> (8 - part)
+    return result
+
+
+def shift_bits_right(packed, shift, length):
+    # Przesunięcie o shift pikseli w prawo do tablicy o length bajtach w wierszu; z lewej wchodzą zera
+    whole, part = divmod(shift, 8)
+    result = np.zeros((packed.shape[0], length), dtype=np.uint8)
+    count = max(0, min(packed.shape[1], length - whole))
+
+    result[:, whole:whole + count] = packed[:, :count] >> part
+    if part:
+        count = max(0, min(packed.shape[1], length - whole - 1))
+        result[:, whole + 1:whole + 1 + count] |= packed[:, :count] << (8 - part)
+    return result
+
+
+def reduce_rows(packed, size, operation):
+    # Okno o długości size złożone z okien o długościach 1, 2, 4, ... - log2(size) operacji na bajtach
+    span = 1
+    while span * 2 <= size:
+        packed = operation(packed[:-span], packed[span:])
+        span *= 2
+    if span < size:
+        packed = operation(packed[:len(packed) - (size - span)], packed[size - span:])
+    return packed
+
+
+def reduce_columns(packed, size, operation):
+    span = 1
+    while span * 2 <= size:
+        packed = operation(packed, shift_bits_left(packed, span))
+        span *= 2
+    if span < size:
+        packed = operation(packed, shift_bits_left(packed, size - span))
+    return packed
+
+
+class PackedBinaryImage:
+    # Obraz binarny (0/255) zapisany po 8 pikseli w bajcie; bit 1 oznacza piksel 255
+    def __init__(self, bits, width):
+        self.bits = bits
+        self.width = width
+
+    @classmethod
+    def from_array(cls, image):
+        if not is_binary(image):
+            raise ValueError("Obraz binarny może zawierać tylko wartości 0 i 255")
+        return cls(np.packbits(image == 255, axis=1), image.shape[1])
+
+    def to_array(self):
+        return np.unpackbits(self.bits, axis=1, count=self.width) * np.uint8(255)
+
+    @property
+    def shape(self):
+        return self.bits.shape[0], self.width
+
+    def column_bits(self, columns):
+        # Wartości wybranych kolumn jako tablica bitów (wiersze x kolumny)
+        return (self.bits[:, columns // 8] >> (7 - columns % 8)) & 1
+
+    def pad_columns(self, radius, border_type, constant_bit):
+        # Dokleja radius kolumn z każdej strony bezpośrednio w postaci spakowanej
+        length = packed_length(self.width + 2 * radius)
+        padded = shift_bits_right(self.bits, radius, length)
+        if radius == 0:
+            return padded
+
+        for start, position in ((-radius, 0), (self.width, self.width + radius)):
+            columns, inside = border_indices(start, start + radius, self.width, border_type)
+            strip = self.column_bits(columns)
+            if inside is not None:
+                strip[:, ~inside] = constant_bit
+            padded |= shift_bits_right(np.packbits(strip, axis=1), position, length)
+        return padded
+
+    def window(self, radius, border_type, operation, constant_bit):
+        radius_rows, radius_cols = split_radius(radius)
+        padded = self.pad_columns(radius_cols, border_type, constant_bit)
+        padded = reduce_columns(padded, 2 * radius_cols + 1, operation)[:, :self.bits.shape[1]]
+
+        # Wyzerowanie bitów za ostatnim pikselem, żeby spakowany wynik był identyczny z np.packbits
+        tail = self.bits.shape[1] * 8 - self.width
+        padded[:, -1] &= np.uint8((0xFF << tail) & 0xFF)
+
+        padded = pad_image(padded, radius_rows, 0, border_type, 0xFF * constant_bit)
+        return PackedBinaryImage(reduce_rows(padded, 2 * radius_rows + 1, operation), self.width)
+
+    def dilatation(self, radius=1, border_type="reflect"):
+        # Jak dilatation() w main.py: piksel pozostaje 255 tylko, gdy całe otoczenie jest 255 (AND)
+        return self.window(radius, border_type, np.bitwise_and, 1)
+
+    def erosion(self, radius=1, border_type="reflect"):
+        # Jak erosion() w main.py: piksel staje się 255, gdy w otoczeniu jest choć jedno 255 (OR)
+        return self.window(radius, border_type, np.bitwise_or, 0)
+
+    def opening(self, radius=1, border_type="reflect"):
+        return self.erosion(radius, border_type).dilatation(radius, border_type)
+
+    def closing(self, radius=1, border_type="reflect"):
+        return self.dilatation(radius, border_type).erosion(radius, border_type)
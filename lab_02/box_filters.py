@@ -0,0 +1,39 @@
+# box_filters.py
+
+import numpy as np
+
+from morphology import split_radius
+from padding import pad_image
+
+
+def summed_area_table(padded):
+    # Tablica sum prefiksowych z dodatkowym wierszem i kolumną zer: table[i, j] = suma padded[:i, :j].
+    # Dla obrazów uint8 sumy są liczone w int64, więc są dokładne
+    dtype = np.int64 if np.issubdtype(padded.dtype, np.integer) else np.float64
+    table = np.zeros((padded.shape[0] + 1, padded.shape[1] + 1) + padded.shape[2:], dtype=dtype)
+    np.cumsum(padded, axis=0, dtype=dtype, out=table[1:, 1:])
+    np.cumsum(table[1:, 1:], axis=1, out=table[1:, 1:])
+    return table
+
+
+def box_sum_padded(padded, krows, kcols, rows, cols):
+    # Suma w oknie krows x kcols zaczynającym się w (i, j) obrazu rozszerzonego - cztery odczyty na piksel
+    table = summed_area_table(padded)
+    return (table[krows:krows + rows, kcols:kcols + cols] - table[:rows, kcols:kcols + cols]
+            - table[krows:krows + rows, :cols] + table[:rows, :cols])
+
+
+def box_filter(image, radius=1, border_type="reflect", constant_value=0):
+    # Suma pikseli w oknie (2r + 1) x (2r + 1); piksele spoza obrazu jak w get_pixel()
+    radius_rows, radius_cols = split_radius(radius)
+    padded = pad_image(image, radius_rows, radius_cols, border_type, constant_value)
+    rows, cols = image.shape[:2]
+    return box_sum_padded(padded, 2 * radius_rows + 1, 2 * radius_cols + 1, rows, cols)
+
+
+def mean_filter(image, radius=1, border_type="reflect", constant_value=0):
+    # Średnia w oknie, obcięta do uint8 tak jak wynik convolution() z maską jedynek
+    radius_rows, radius_cols = split_radius(radius)
+    size = (2 * radius_rows + 1) * (2 * radius_cols + 1)
+    mean = box_filter(image, radius, border_type, constant_value) / size
+    return np.clip(mean, 0, 255).astype(np.uint8)
@@ -0,0 +1,164 @@
+# convolution_backends.py
+
+import numpy as np
+
+from box_filters import box_sum_padded
+from padding import pad_image
+
+# Względny próg drugiej wartości osobliwej, poniżej którego maska jest traktowana jako separowalna
+SEPARABLE_TOLERANCE = 1e-10
+# Koszt FFT na piksel w jednostkach "jednego przejścia maski" (mnożony przez log2 liczby pikseli);
+# zmierzony na obrazie 2000x3000x3 - FFT kosztuje tyle co ok. 16 przejść dla log2 ~ 22.5, czyli 16 / 22.5
+FFT_COST_FACTOR = 0.7
+# Koszt tablicy sum prefiksowych: dwa przebiegi cumsum i cztery odczyty na piksel
+BOX_COST = 6
+
+
+def kernel_padding(kernel):
+    # Przesunięcia m - krows // 2 sięgają od -krows // 2 do krows - 1 - krows // 2 (jak w convolution())
+    krows, kcols = kernel.shape
+    return (krows // 2, krows - 1 - krows // 2), (kcols // 2, kcols - 1 - kcols // 2)
+
+
+def separate_kernel(kernel):
+    # Maska rzędu 1 (np. gauss.txt) to iloczyn zewnętrzny wektora kolumnowego i wierszowego
+    u, s, vt = np.linalg.svd(kernel)
+    if s[0] == 0 or np.any(s[1:] > SEPARABLE_TOLERANCE * s[0]):
+        return None
+    scale = np.sqrt(s[0])
+    return u[:, 0] * scale, vt[0] * scale
+
+
+def constant_value_of(kernel):
+    # Maska jednorodna (np. wczytana z pliku maska jedynek po normalizacji) - zwraca jej wartość albo None
+    value = kernel.flat[0]
+    if value == 0 or np.any(kernel != value):
+        return None
+    return value
+
+
+def output_buffer(out, shape):
+    # Bufor wyniku przekazany przez wywołującego (np. potok kafelków) jest zerowany i używany ponownie
+    if out is None:
+        return np.zeros(shape, dtype=np.float64)
+    out.fill(0)
+    return out
+
+
+def correlate_direct(padded, kernel, rows, cols, out=None):
+    result = output_buffer(out, (rows, cols) + padded.shape[2:])
+    for m in range(kernel.shape[0]):
+        for n in range(kernel.shape[1]):
+            if kernel[m, n] != 0:
+                result += kernel[m, n] * padded[m:m + rows, n:n + cols]
+    return result
+
+
+def correlate_separable(padded, column, row, rows, cols, out=None):
+    # Dwa przebiegi 1D: najpierw wzdłuż wierszy, potem wzdłuż kolumn
+    horizontal = np.zeros((padded.shape[0], cols) + padded.shape[2:], dtype=np.float64)
+    for n in range(len(row)):
+        horizontal += row[n] * padded[:, n:n + cols]
+
+    result = output_buffer(out, (rows, cols) + padded.shape[2:])
+    for m in range(len(column)):
+        result += column[m] * horizontal[m:m + rows]
+    return result
+
+
+def correlate_box(padded, value, krows, kcols, rows, cols, out=None):
+    # Maska stała to suma w oknie razy wartość maski - koszt nie zależy od rozmiaru maski
+    sums = box_sum_padded(padded, krows, kcols, rows, cols)
+    if out is None:
+        return sums * value
+    return np.multiply(sums, value, out=out)
+
+
+def fast_length(n):
+    # Najmniejsza liczba postaci 2^a * 3^b * 5^c nie mniejsza niż n - dla takich długości FFT jest najszybsze
+    best = 2 ** int(np.ceil(np.log2(n)))
+    power_5 = 1
+    while power_5 < best:
+        power_35 = power_5
+        while power_35 < best:
+            length = power_35
+            while length < n:
+                length *= 2
+            best = min(best, length)
+            power_35 *= 3
+        power_5 *= 5
+    return best
+
+
+def correlate_fft(padded, kernel, rows, cols):
+    # Korelacja to splot z odwróconą maską; obszar "valid" nie jest zaburzony przez splot kołowy
+    size = (fast_length(padded.shape[0]), fast_length(padded.shape[1]))
+    image_spectrum = np.fft.rfft2(padded, s=size, axes=(0, 1))
+    kernel_spectrum = np.fft.rfft2(kernel[::-1, ::-1], s=size)
+    if padded.ndim == 3:
+        kernel_spectrum = kernel_spectrum[:, :, np.newaxis]
+
+    full = np.fft.irfft2(image_spectrum * kernel_spectrum, s=size, axes=(0, 1))
+    krows, kcols = kernel.shape
+    return full[krows - 1:krows - 1 + rows, kcols - 1:kcols - 1 + cols]
+
+
+def choose_backend(kernel, padded_shape):
+    krows, kcols = kernel.shape
+    direct_cost = krows * kcols
+    fft_cost = FFT_COST_FACTOR * np.log2(padded_shape[0] * padded_shape[1])
+
+    costs = {"direct": direct_cost, "fft": fft_cost}
+    if constant_value_of(kernel) is not None:
+        costs["box"] = BOX_COST
+    if separate_kernel(kernel) is not None:
+        costs["separable"] = krows + kcols
+    return min(costs, key=costs.get)
+
+
+def correlate_padded(padded, kernel, rows, cols, method="auto", out=None):
+    if method == "auto":
+        method = choose_backend(kernel, padded.shape)
+
+    if method == "numba":
+        # Jądra numba czytają bezpośrednio piksele uint8 i same dzielą obraz na pasy wierszy;
+        # bez pakietu numba używany jest backend wybrany automatycznie
+        try:
+            from numba_kernels import correlate_numba
+        except ImportError:
+            method = choose_backend(kernel, padded.shape)
+        else:
+            return correlate_numba(padded, kernel, rows, cols)
+    if method == "box":
+        # Tablica sum prefiksowych jest liczona w int64 bezpośrednio z pikseli uint8
+        value = constant_value_of(kernel)
+        if value is None:
+            raise ValueError("Maska nie jest stała")
+        return correlate_box(padded, value, kernel.shape[0], kernel.shape[1], rows, cols, out)
+
+    padded = padded.astype(np.float64)
+    if method == "direct":
+        return correlate_direct(padded, kernel, rows, cols, out)
+    elif method == "separable":
+        factors = separate_kernel(kernel)
+        if factors is None:
+            raise ValueError("Maska nie jest separowalna")
+        return correlate_separable(padded, factors[0], factors[1], rows, cols, out)
+    elif method == "fft":
+        return correlate_fft(padded, kernel, rows, cols)
+    raise ValueError(f"Nieznana metoda splotu: {method}")
+
+
+def correlate(image, kernel, border_type="reflect", constant_value=0, method="auto"):
+    rows, cols = image.shape[:2]
+    pad_rows, pad_cols = kernel_padding(kernel)
+    padded = pad_image(image, pad_rows, pad_cols, border_type, constant_value)
+    return correlate_padded(padded, kernel, rows, cols, method)
+
+
+def scale_convolution(value, kernel_sum):
+    # Ta sama normalizacja wyniku co w pętli convolution(method="python")
+    if kernel_sum <= 0:
+        value += 255
+    result = (value / kernel_sum).astype(np.float32)
+    return np.clip(result, 0, 255).astype(np.uint8)
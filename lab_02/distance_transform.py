@@ -0,0 +1,139 @@
+# distance_transform.py
+
+import hashlib
+
+import numpy as np
+from numba import njit, prange
+
+from padding import pad_image
+
+# "Nieskończona" odległość dla pikseli bez punktów wzorca w pobliżu
+FAR = 1e20
+# Domyślna liczba ostatnio używanych obrazów, dla których przechowywane są transformaty
+# (zmiana przez set_cache_size(), 0 wyłącza pamięć podręczną)
+CACHE_SIZE = 4
+# Domyślny zapas przy rozszerzaniu obrazu - wystarcza na przegląd promieni 1..50 bez ponownego liczenia
+DEFAULT_MAX_RADIUS = 50
+
+
+@njit
+def squared_distance_1d(f, result, v, z):
+    # Felzenszwalb-Huttenlocher: dolna obwiednia parabol, czas liniowy względem długości wiersza
+    n = len(f)
+    k = 0
+    v[0] = 0
+    z[0] = -FAR
+    z[1] = FAR
+    for q in range(1, n):
+        s = ((f[q] + q * q) - (f[v[k]] + v[k] * v[k])) / (2 * q - 2 * v[k])
+        while s <= z[k]:
+            k -= 1
+            s = ((f[q] + q * q) - (f[v[k]] + v[k] * v[k])) / (2 * q - 2 * v[k])
+        k += 1
+        v[k] = q
+        z[k] = s
+        z[k + 1] = FAR
+
+    k = 0
+    for q in range(n):
+        while z[k + 1] < q:
+            k += 1
+        result[q] = (q - v[k]) ** 2 + f[v[k]]
+
+
+@njit(parallel=True)
+def squared_distance_transform(features):
+    # Kwadrat odległości euklidesowej do najbliższego piksela, dla którego features == True
+    rows, cols = features.shape
+    distances = np.empty((rows, cols))
+
+    for j in prange(cols):
+        f = np.where(features[:, j], 0.0, FAR)
+        squared_distance_1d(f, distances[:, j], np.empty(rows, dtype=np.int64), np.empty(rows + 1))
+
+    for i in prange(rows):
+        f = distances[i].copy()
+        squared_distance_1d(f, distances[i], np.empty(cols, dtype=np.int64), np.empty(cols + 1))
+    return distances
+
+
+class DiskMorphology:
+    # Morfologia z elementem strukturalnym w kształcie koła: jedna transformata odległości na obraz,
+    # a każdy promień to już tylko porównanie z R^2
+    def __init__(self, image, border_type="reflect", max_radius=DEFAULT_MAX_RADIUS):
+        self.image = image
+        self.border_type = border_type
+        self.max_radius = max_radius
+        self.transforms = {}
+
+    def squared_distances(self, target):
+        # Odległość do najbliższego piksela o wartości target; obraz jest rozszerzony o max_radius,
+        # więc wynik jest dokładny dla promieni nie większych niż max_radius. Przechowywany jest tylko
+        # wycięty obszar obrazu jako int32 (kwadraty odległości są całkowite, a wartości powyżej
+        # max_radius^2 są obcinane), a nie float64 z całym rozszerzonym obrazem
+        if target not in self.transforms:
+            margin = self.max_radius
+            padded = pad_image(self.image, margin, margin, self.border_type, 255 - target)
+            distances = squared_distance_transform(padded == target)
+            cropped = distances[margin:margin + self.image.shape[0], margin:margin + self.image.shape[1]]
+            self.transforms[target] = np.minimum(cropped, (margin + 1) ** 2).astype(np.int32)
+        return self.transforms[target]
+
+    def check_radius(self, radius):
+        if radius > self.max_radius:
+            raise ValueError(f"Promień {radius} większy niż max_radius={self.max_radius}")
+
+    def dilatation(self, radius=1):
+        # Jak dilatation(): piksel 255 staje się 0, jeśli w odległości <= radius jest piksel 0
+        self.check_radius(radius)
+        result = self.image.copy()
+        result[(self.image == 255) & (self.squared_distances(0) <= radius ** 2)] = 0
+        return result
+
+    def erosion(self, radius=1):
+        # Jak erosion(): piksel 0 staje się 255, jeśli w odległości <= radius jest piksel 255
+        self.check_radius(radius)
+        result = self.image.copy()
+        result[(self.image == 0) & (self.squared_distances(255) <= radius ** 2)] = 255
+        return result
+
+    def opening(self, radius=1):
+        # Drugi etap działa na obrazie pośrednim, więc wymaga jego własnej transformaty
+        eroded = self.erosion(radius)
+        return DiskMorphology(eroded, self.border_type, radius).dilatation(radius)
+
+    def closing(self, radius=1):
+        dilated = self.dilatation(radius)
+        return DiskMorphology(dilated, self.border_type, radius).erosion(radius)
+
+
+DISK_MORPHOLOGY_CACHE = {}
+
+
+def set_cache_size(size):
+    # Nowy limit pamięci podręcznej; nadmiarowe (najstarsze) wpisy są usuwane od razu
+    global CACHE_SIZE
+    CACHE_SIZE = size
+    while len(DISK_MORPHOLOGY_CACHE) > max(size, 0):
+        DISK_MORPHOLOGY_CACHE.pop(next(iter(DISK_MORPHOLOGY_CACHE)))
+
+
+def clear_cache():
+    DISK_MORPHOLOGY_CACHE.clear()
+
+
+def disk_morphology(image, border_type="reflect", max_radius=DEFAULT_MAX_RADIUS):
+    # Obiekty z transformatami są pamiętane według zawartości obrazu, więc kolejne wywołania
+    # dilatation(..., method="disk") z innym promieniem nie liczą transformaty od nowa
+    key = (hashlib.sha1(image.tobytes()).hexdigest(), image.shape, border_type)
+    cached = DISK_MORPHOLOGY_CACHE.pop(key, None)
+    if cached is not None and cached.max_radius >= max_radius:
+        # Ponowne wstawienie przenosi wpis na koniec - usuwany jest najdawniej używany (LRU)
+        DISK_MORPHOLOGY_CACHE[key] = cached
+    else:
+        cached = DiskMorphology(image.copy(), border_type, max_radius)
+        if CACHE_SIZE > 0:
+            if len(DISK_MORPHOLOGY_CACHE) >= CACHE_SIZE:
+                DISK_MORPHOLOGY_CACHE.pop(next(iter(DISK_MORPHOLOGY_CACHE)))
+            DISK_MORPHOLOGY_CACHE[key] = cached
+    return cached
@@ -1,6 +1,11 @@
 from PIL import Image, ImageEnhance
 import numpy as np
 
+from binary_packed import PackedBinaryImage
+from convolution_backends import correlate, scale_convolution
+from histogram import auto_threshold, histogram_for_image, threshold_percent_for_level
+from morphology import choose_morphology_method, dilatation_vectorized, erosion_vectorized
+
 
 def load_image(file_path):
     image = Image.open(file_path)
@@ -39,6 +44,10 @@ def brighten_image(image, percent):
 
 
 def binary_threshold(image, threshold_percent=50):
+    # Zamiast procentu można podać metodę automatyczną: "otsu", "mean" lub "pNN"
+    if isinstance(threshold_percent, str):
+        level = auto_threshold(histogram_for_image(image), threshold_percent)
+        threshold_percent = threshold_percent_for_level(level)
     image = Image.fromarray(image)
     image = image.convert('L')
     threshold = threshold_percent / 100.0 * 256
@@ -82,7 +91,39 @@ def normalize_if_needed(mask):
     return mask
 
 
-def dilatation(image, radius=1, border_type="reflect"):
+def numba_morphology(name):
+    # Numba jest opcjonalna - bez niej method="numba" liczy to samo wersją "numpy"
+    try:
+        import numba_kernels
+    except ImportError:
+        return None
+    return getattr(numba_kernels, f"{name}_numba")
+
+
+def disk(image, radius, border_type="reflect"):
+    # Transformata odległości (distance_transform.py) wymaga numby, więc jest importowana dopiero tutaj
+    from distance_transform import DEFAULT_MAX_RADIUS, disk_morphology
+    return disk_morphology(image, border_type, max(radius, DEFAULT_MAX_RADIUS))
+
+
+def dilatation(image, radius=1, border_type="reflect", method="auto"):
+    # method: "auto", "numpy" (okna przesuwne), "van_herk" (koszt niezależny od promienia),
+    # "packed" (8 pikseli w bajcie), "numba" (pasy wierszy na wszystkich rdzeniach), "python"
+    # lub "disk" (element w kształcie koła zamiast kwadratu, przez transformatę odległości)
+    if method == "auto":
+        method = choose_morphology_method(image, radius)
+    if method == "packed":
+        return PackedBinaryImage.from_array(image).dilatation(radius, border_type).to_array()
+    if method == "disk":
+        return disk(image, radius, border_type).dilatation(radius)
+    if method == "numba":
+        kernel = numba_morphology("dilatation")
+        if kernel is not None:
+            return kernel(image, radius, border_type)
+        method = "numpy"
+    if method != "python":
+        return dilatation_vectorized(image, radius, border_type, method)
+
     result = image.copy()
     rows = len(image)
     cols = len(image[0])
@@ -100,7 +141,24 @@ def dilatation(image, radius=1, border_type="reflect"):
     return result
 
 
-def erosion(image, radius=1, border_type="reflect"):
+def erosion(image, radius=1, border_type="reflect", method="auto"):
+    # method: "auto", "numpy" (okna przesuwne), "van_herk" (koszt niezależny od promienia),
+    # "packed" (8 pikseli w bajcie), "numba" (pasy wierszy na wszystkich rdzeniach), "python"
+    # lub "disk" (element w kształcie koła zamiast kwadratu, przez transformatę odległości)
+    if method == "auto":
+        method = choose_morphology_method(image, radius)
+    if method == "packed":
+        return PackedBinaryImage.from_array(image).erosion(radius, border_type).to_array()
+    if method == "disk":
+        return disk(image, radius, border_type).erosion(radius)
+    if method == "numba":
+        kernel = numba_morphology("erosion")
+        if kernel is not None:
+            return kernel(image, radius, border_type)
+        method = "numpy"
+    if method != "python":
+        return erosion_vectorized(image, radius, border_type, method)
+
     result = image.copy()
     rows = len(image)
     cols = len(image[0])
@@ -118,19 +176,35 @@ def erosion(image, radius=1, border_type="reflect"):
     return result
 
 
-def morphological_opening(image, radius=1):
-    eroded_image = erosion(image, radius=radius)
-    opened_image = dilatation(eroded_image, radius=radius)
+def morphological_opening(image, radius=1, method="auto"):
+    if method == "auto":
+        method = choose_morphology_method(image, radius)
+    if method == "packed":
+        # Obraz jest pakowany raz, oba etapy działają na 1/8 pamięci
+        return PackedBinaryImage.from_array(image).opening(radius).to_array()
+    if method == "disk":
+        # Transformata obrazu wejściowego jest wspólna dla wszystkich promieni
+        return disk(image, radius).opening(radius)
+
+    eroded_image = erosion(image, radius=radius, method=method)
+    opened_image = dilatation(eroded_image, radius=radius, method=method)
     return opened_image
 
 
-def morphological_closing(image, radius=1):
-    dilated_image = dilatation(image, radius=radius)
-    closed_image = erosion(dilated_image, radius=radius)
+def morphological_closing(image, radius=1, method="auto"):
+    if method == "auto":
+        method = choose_morphology_method(image, radius)
+    if method == "packed":
+        return PackedBinaryImage.from_array(image).closing(radius).to_array()
+    if method == "disk":
+        return disk(image, radius).closing(radius)
+
+    dilated_image = dilatation(image, radius=radius, method=method)
+    closed_image = erosion(dilated_image, radius=radius, method=method)
     return closed_image
 
 
-def convolution(image, mask, border_type="reflect", constant_value=0):
+def convolution(image, mask, border_type="reflect", constant_value=0, method="auto"):
 
     channels = len(image[0][0]) if len(image.shape) == 3 else 1
     rows, cols = len(image), len(image[0])
@@ -143,6 +217,12 @@ def convolution(image, mask, border_type="reflect", constant_value=0):
     if kernel_sum == 0:
         kernel_sum = 1
 
+    # method: "auto" (wybór wg rozmiaru maski i obrazu), "separable", "fft", "direct", "box" (tablica sum
+    # prefiksowych, tylko dla masek jednorodnych - inaczej ValueError), "numba" lub "python"
+    if method != "python":
+        value = correlate(image, kernel, border_type, constant_value, method)
+        return scale_convolution(value, kernel_sum)
+
     result = np.zeros_like(image, dtype=np.float32)
 
     for color in range(channels):
@@ -0,0 +1,89 @@
+# morphology.py
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from padding import pad_image
+
+# Od tego promienia van Herk/Gil-Werman jest szybszy od okien przesuwnych (pomiar na obrazie 2000x3000)
+VAN_HERK_MIN_RADIUS = 4
+
+
+def split_radius(radius):
+    # Promień może być liczbą (kwadrat) albo parą (promień w pionie, promień w poziomie) - prostokąt
+    if isinstance(radius, tuple):
+        return radius
+    return radius, radius
+
+
+def window_max(padded, radius_rows, radius_cols):
+    # Prostokątny element strukturalny jest separowalny: najpierw okno w poziomie, potem w pionie
+    rows_max = sliding_window_view(padded, 2 * radius_cols + 1, axis=1).max(axis=-1)
+    return sliding_window_view(rows_max, 2 * radius_rows + 1, axis=0).max(axis=-1)
+
+
+def running_max(array, size, axis):
+    # Algorytm van Herka/Gil-Wermana: maksimum w oknie o długości size niezależnie od size
+    # (dwa przebiegi prefiksowe w blokach o długości okna i jedno porównanie na element)
+    array = np.moveaxis(array, axis, 0)
+    length = array.shape[0]
+    blocks = -(-length // size)
+    rest = array.shape[1:]
+
+    padded = np.zeros((blocks * size,) + rest, dtype=array.dtype)
+    padded[:length] = array
+    padded = padded.reshape((blocks, size) + rest)
+
+    prefix = np.maximum.accumulate(padded, axis=1).reshape((blocks * size,) + rest)
+    suffix = np.maximum.accumulate(padded[:, ::-1], axis=1)[:, ::-1].reshape((blocks * size,) + rest)
+
+    # Okno [i, i + size - 1] obejmuje koniec bloku z i oraz początek bloku z i + size - 1
+    out_length = length - size + 1
+    result = np.maximum(suffix[:out_length], prefix[size - 1:size - 1 + out_length])
+    return np.moveaxis(result, 0, axis)
+
+
+def window_max_van_herk(padded, radius_rows, radius_cols):
+    rows_max = running_max(padded, 2 * radius_cols + 1, axis=1)
+    return running_max(rows_max, 2 * radius_rows + 1, axis=0)
+
+
+WINDOW_MAX = {
+    "numpy": window_max,
+    "van_herk": window_max_van_herk,
+}
+
+
+def is_binary(image):
+    return not np.any((image != 0) & (image != 255))
+
+
+def choose_morphology_method(image, radius):
+    # Obrazy po binary_threshold() najszybciej przetwarza wersja spakowana bitowo
+    if is_binary(image):
+        return "packed"
+    if max(split_radius(radius)) >= VAN_HERK_MIN_RADIUS:
+        return "van_herk"
+    return "numpy"
+
+
+def dilatation_vectorized(image, radius=1, border_type="reflect", method="numpy"):
+    # Piksel 255 staje się 0, jeśli w otoczeniu jest choć jedno 0 (poza obrazem stała 255)
+    radius_rows, radius_cols = split_radius(radius)
+    padded = pad_image(image, radius_rows, radius_cols, border_type, 255)
+    has_zero = WINDOW_MAX[method](padded == 0, radius_rows, radius_cols)
+
+    result = image.copy()
+    result[has_zero & (image == 255)] = 0
+    return result
+
+
+def erosion_vectorized(image, radius=1, border_type="reflect", method="numpy"):
+    # Piksel 0 staje się 255, jeśli w otoczeniu jest choć jedno 255 (poza obrazem stała 0)
+    radius_rows, radius_cols = split_radius(radius)
+    padded = pad_image(image, radius_rows, radius_cols, border_type, 0)
+    has_white = WINDOW_MAX[method](padded == 255, radius_rows, radius_cols)
+
+    result = image.copy()
+    result[has_white & (image == 0)] = 255
+    return result
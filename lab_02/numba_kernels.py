@@ -0,0 +1,78 @@
+# numba_kernels.py
+
+import numpy as np
+from numba import get_num_threads, njit, prange
+
+from morphology import split_radius
+from padding import pad_image
+
+
+@njit
+def band_bounds(band, bands, rows):
+    band_size = (rows + bands - 1) // bands
+    return band * band_size, min((band + 1) * band_size, rows)
+
+
+@njit(parallel=True)
+def correlate_bands(padded, kernel, rows, cols):
+    # padded ma zawsze wymiar kanałów, więc wszystkie kolory liczone są w jednym przebiegu
+    channels = padded.shape[2]
+    krows, kcols = kernel.shape
+    result = np.zeros((rows, cols, channels))
+
+    # Każdy wątek dostaje własny pas wierszy
+    bands = min(get_num_threads(), rows)
+    for band in prange(bands):
+        start, stop = band_bounds(band, bands, rows)
+        for i in range(start, stop):
+            for j in range(cols):
+                for m in range(krows):
+                    for n in range(kcols):
+                        weight = kernel[m, n]
+                        for color in range(channels):
+                            result[i, j, color] += weight * padded[i + m, j + n, color]
+    return result
+
+
+@njit(parallel=True)
+def replace_if_neighbor(image, padded, radius_rows, radius_cols, center, neighbor):
+    # Piksel o wartości center przyjmuje wartość neighbor, jeśli ta występuje w jego otoczeniu
+    rows, cols = image.shape
+    result = image.copy()
+
+    bands = min(get_num_threads(), rows)
+    for band in prange(bands):
+        start, stop = band_bounds(band, bands, rows)
+        for i in range(start, stop):
+            for j in range(cols):
+                if image[i, j] != center:
+                    continue
+                found = False
+                for di in range(2 * radius_rows + 1):
+                    for dj in range(2 * radius_cols + 1):
+                        if padded[i + di, j + dj] == neighbor:
+                            found = True
+                            break
+                    if found:
+                        break
+                if found:
+                    result[i, j] = neighbor
+    return result
+
+
+def correlate_numba(padded, kernel, rows, cols):
+    if padded.ndim == 2:
+        return correlate_bands(padded[:, :, np.newaxis], kernel, rows, cols)[:, :, 0]
+    return correlate_bands(padded, kernel, rows, cols)
+
+
+def dilatation_numba(image, radius=1, border_type="reflect"):
+    radius_rows, radius_cols = split_radius(radius)
+    padded = pad_image(image, radius_rows, radius_cols, border_type, 255)
+    return replace_if_neighbor(image, padded, radius_rows, radius_cols, 255, 0)
+
+
+def erosion_numba(image, radius=1, border_type="reflect"):
+    radius_rows, radius_cols = split_radius(radius)
+    padded = pad_image(image, radius_rows, radius_cols, border_type, 0)
+    return replace_if_neighbor(image, padded, radius_rows, radius_cols, 0, 255)
@@ -0,0 +1,49 @@
+# padding.py
+
+import numpy as np
+
+# Odpowiedniki trybów brzegowych z get_pixel() w np.pad
+PAD_MODES = {
+    "constant": "constant",  # wartość stała dookoła obrazu
+    "replicate": "edge",  # rozszerzenie skrajnego piksela
+    "reflect": "reflect",  # odbicie lustrzane bez powtarzania skrajnego piksela
+    "wrap": "wrap",  # kopia pikseli od drugiej strony obrazu
+}
+
+
+def as_pair(pad):
+    if isinstance(pad, tuple):
+        return pad
+    return pad, pad
+
+
+def pad_image(image, pad_rows, pad_cols, border_type="reflect", constant_value=0):
+    if border_type not in PAD_MODES:
+        raise ValueError(f"Nieznany typ brzegu: {border_type}")
+
+    # Szerokość może być liczbą (symetrycznie) albo parą (przed, po), np. dla masek o parzystym rozmiarze
+    pad_width = [as_pair(pad_rows), as_pair(pad_cols)]
+    # Kanały kolorów (trzeci wymiar) nie są rozszerzane
+    pad_width += [(0, 0)] * (image.ndim - 2)
+
+    if border_type == "constant":
+        return np.pad(image, pad_width, mode="constant", constant_values=constant_value)
+    return np.pad(image, pad_width, mode=PAD_MODES[border_type])
+
+
+def border_indices(start, stop, size, border_type):
+    # Indeksy źródłowe dla zakresu [start, stop) zgodne z get_pixel(); inside = False oznacza wartość stałą
+    indices = np.arange(start, stop)
+    inside = (indices >= 0) & (indices < size)
+
+    if border_type == "constant":
+        return np.clip(indices, 0, size - 1), inside
+    elif border_type == "replicate":
+        return np.clip(indices, 0, size - 1), None
+    elif border_type == "reflect":
+        period = max(2 * size - 2, 1)
+        indices = indices % period
+        return np.where(indices >= size, period - indices, indices), None
+    elif border_type == "wrap":
+        return indices % size, None
+    raise ValueError(f"Nieznany typ brzegu: {border_type}")
@@ -0,0 +1,134 @@
+# pipeline.py
+
+import numpy as np
+
+from binary_packed import PackedBinaryImage
+from convolution_backends import choose_backend, correlate_padded, kernel_padding, scale_convolution
+from histogram import auto_threshold, threshold_percent_for_level
+from main import binary_threshold, normalize_if_needed
+from morphology import (choose_morphology_method, dilatation_vectorized, erosion_vectorized, is_binary,
+                        split_radius)
+from padding import pad_image
+from tiling import open_bmp_memmap, process_bmp_tiled, process_tiled, tiled_histogram
+
+VECTORIZED_MORPHOLOGY = {
+    "dilatation": dilatation_vectorized,
+    "erosion": erosion_vectorized,
+}
+
+
+def as_array(image):
+    if isinstance(image, PackedBinaryImage):
+        return image.to_array()
+    return image
+
+
+class Pipeline:
+    # Łańcuch operacji deklarowany raz, np. Pipeline().threshold(50).erode(1).dilate(1).convolve(gauss),
+    # i wykonywany w całości na każdym kafelku
+    def __init__(self, border_type="reflect"):
+        self.border_type = border_type
+        self.stages = []
+        self.scratch = {}
+
+    def threshold(self, threshold_percent=50):
+        self.stages.append(("threshold", threshold_percent))
+        return self
+
+    def dilate(self, radius=1):
+        self.stages.append(("dilatation", radius))
+        return self
+
+    def erode(self, radius=1):
+        self.stages.append(("erosion", radius))
+        return self
+
+    def open(self, radius=1):
+        return self.erode(radius).dilate(radius)
+
+    def close(self, radius=1):
+        return self.dilate(radius).erode(radius)
+
+    def convolve(self, mask, constant_value=0, method="auto"):
+        # Maska jest normalizowana raz, przy deklaracji, a nie dla każdego kafelka
+        kernel = normalize_if_needed(np.array(mask, dtype=np.float64))
+        kernel_sum = np.sum(kernel)
+        if kernel_sum == 0:
+            kernel_sum = 1
+        self.stages.append(("convolution", (kernel, kernel_sum, constant_value, method)))
+        return self
+
+    def halo(self):
+        # Zakładki kolejnych etapów sumują się
+        top = bottom = left = right = 0
+        for name, params in self.stages:
+            if name in ("dilatation", "erosion"):
+                radius_rows, radius_cols = split_radius(params)
+                top, bottom = top + radius_rows, bottom + radius_rows
+                left, right = left + radius_cols, right + radius_cols
+            elif name == "convolution":
+                (kernel_top, kernel_bottom), (kernel_left, kernel_right) = kernel_padding(params[0])
+                top, bottom = top + kernel_top, bottom + kernel_bottom
+                left, right = left + kernel_left, right + kernel_right
+        return (top, bottom), (left, right)
+
+    def buffer(self, name, shape):
+        # Bufory pomocnicze są przydzielane raz i używane ponownie dla kafelków tego samego rozmiaru
+        buffer = self.scratch.get(name)
+        if buffer is None or buffer.shape != shape:
+            buffer = np.empty(shape, dtype=np.float64)
+            self.scratch[name] = buffer
+        return buffer
+
+    def morphology_stage(self, image, name, radius):
+        # Kolejne etapy morfologiczne na obrazie binarnym działają na postaci spakowanej bez rozpakowywania
+        if isinstance(image, PackedBinaryImage):
+            return getattr(image, name)(radius, self.border_type)
+        if is_binary(image):
+            return getattr(PackedBinaryImage.from_array(image), name)(radius, self.border_type)
+        method = choose_morphology_method(image, radius)
+        return VECTORIZED_MORPHOLOGY[name](image, radius, self.border_type, method)
+
+    def convolution_stage(self, image, kernel, kernel_sum, constant_value, method):
+        rows, cols = image.shape[:2]
+        pad_rows, pad_cols = kernel_padding(kernel)
+        padded = pad_image(image, pad_rows, pad_cols, self.border_type, constant_value)
+        if method == "auto":
+            method = choose_backend(kernel, padded.shape)
+
+        out = self.buffer("convolution", (rows, cols) + image.shape[2:])
+        return scale_convolution(correlate_padded(padded, kernel, rows, cols, method, out), kernel_sum)
+
+    def tiled_stages(self, image):
+        # Próg automatyczny ("otsu", "mean", "pNN") liczony na kafelku zależałby od jego histogramu,
+        # więc przed podziałem na kafelki zamieniany jest na procent z histogramu całego obrazu. Działa to
+        # tylko dla progu będącego pierwszym etapem - dalsze etapy widzą obraz już przetworzony
+        stages = list(self.stages)
+        for index, (name, params) in enumerate(stages):
+            if name == "threshold" and isinstance(params, str):
+                if index > 0:
+                    raise ValueError("Próg automatyczny w trybie kafelkowym musi być pierwszym etapem")
+                level = auto_threshold(tiled_histogram(image), params)
+                stages[index] = (name, threshold_percent_for_level(level))
+        return stages
+
+    def run(self, image, stages=None):
+        current = image
+        for name, params in self.stages if stages is None else stages:
+            if name == "threshold":
+                current = binary_threshold(as_array(current), params)
+            elif name in ("dilatation", "erosion"):
+                current = self.morphology_stage(current, name, params)
+            elif name == "convolution":
+                current = self.convolution_stage(as_array(current), *params)
+        return as_array(current)
+
+    def run_tiled(self, image, output, tile_size=(512, 512)):
+        stages = self.tiled_stages(image)
+        return process_tiled(image, output, lambda tile: self.run(tile, stages), self.halo(), tile_size,
+                             self.border_type)
+
+    def run_bmp(self, input_path, output_path, tile_size=(512, 512)):
+        stages = self.tiled_stages(open_bmp_memmap(input_path))
+        return process_bmp_tiled(input_path, output_path, lambda tile: self.run(tile, stages), self.halo(),
+                                 tile_size, self.border_type)
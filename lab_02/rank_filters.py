@@ -0,0 +1,105 @@
+# rank_filters.py
+
+import numpy as np
+from numba import get_num_threads, njit, prange
+
+from morphology import split_radius
+from numba_kernels import band_bounds
+from padding import pad_image
+
+# Histogram dwupoziomowy: 16 przedziałów zgrubnych po 16 jasności
+COARSE_BINS = 16
+FINE_PER_COARSE = 16
+
+
+@njit
+def find_rank(histogram, coarse, rank):
+    # Najpierw przedział zgrubny, potem dokładna jasność - najwyżej 32 kroki zamiast 256
+    cumulative = 0
+    bucket = 0
+    while cumulative + coarse[bucket] <= rank:
+        cumulative += coarse[bucket]
+        bucket += 1
+
+    value = bucket * FINE_PER_COARSE
+    while cumulative + histogram[value] <= rank:
+        cumulative += histogram[value]
+        value += 1
+    return value
+
+
+@njit
+def add_histogram(fine, coarse, column_fine, column_coarse, sign):
+    for value in range(256):
+        fine[value] += sign * column_fine[value]
+    for bucket in range(COARSE_BINS):
+        coarse[bucket] += sign * column_coarse[bucket]
+
+
+@njit(parallel=True)
+def rank_filter_bands(padded, radius_rows, radius_cols, rank):
+    # Algorytm Perreault: histogramy kolumn przesuwane w dół, histogram okna przesuwany w prawo
+    # o jedną kolumnę - koszt na piksel nie zależy od promienia
+    rows = padded.shape[0] - 2 * radius_rows
+    cols = padded.shape[1] - 2 * radius_cols
+    window_cols = 2 * radius_cols + 1
+    result = np.empty((rows, cols), dtype=np.uint8)
+
+    bands = min(get_num_threads(), rows)
+    for band in prange(bands):
+        start, stop = band_bounds(band, bands, rows)
+        column_fine = np.zeros((padded.shape[1], 256), dtype=np.int32)
+        column_coarse = np.zeros((padded.shape[1], COARSE_BINS), dtype=np.int32)
+        for x in range(padded.shape[1]):
+            for y in range(start, start + 2 * radius_rows + 1):
+                column_fine[x, padded[y, x]] += 1
+                column_coarse[x, padded[y, x] // FINE_PER_COARSE] += 1
+
+        fine = np.zeros(256, dtype=np.int32)
+        coarse = np.zeros(COARSE_BINS, dtype=np.int32)
+        for i in range(start, stop):
+            if i > start:
+                for x in range(padded.shape[1]):
+                    removed = padded[i - 1, x]
+                    added = padded[i + 2 * radius_rows, x]
+                    column_fine[x, removed] -= 1
+                    column_coarse[x, removed // FINE_PER_COARSE] -= 1
+                    column_fine[x, added] += 1
+                    column_coarse[x, added // FINE_PER_COARSE] += 1
+
+            fine[:] = 0
+            coarse[:] = 0
+            for x in range(window_cols):
+                add_histogram(fine, coarse, column_fine[x], column_coarse[x], 1)
+
+            for j in range(cols):
+                if j > 0:
+                    entering = j + window_cols - 1
+                    add_histogram(fine, coarse, column_fine[entering], column_coarse[entering], 1)
+                    add_histogram(fine, coarse, column_fine[j - 1], column_coarse[j - 1], -1)
+                result[i, j] = find_rank(fine, coarse, rank)
+    return result
+
+
+def rank_filter(image, radius=1, percentile=50, border_type="reflect", constant_value=0):
+    # Wartość o zadanym percentylu w oknie (2r + 1) x (2r + 1); 0 - minimum, 50 - mediana, 100 - maksimum
+    if image.dtype != np.uint8:
+        raise ValueError("Filtry rangowe obsługują tylko obrazy uint8")
+
+    radius_rows, radius_cols = split_radius(radius)
+    size = (2 * radius_rows + 1) * (2 * radius_cols + 1)
+    rank = int(round(percentile / 100 * (size - 1)))
+
+    padded = pad_image(image, radius_rows, radius_cols, border_type, constant_value)
+    if image.ndim == 2:
+        return rank_filter_bands(padded, radius_rows, radius_cols, rank)
+
+    result = np.empty_like(image)
+    for color in range(image.shape[2]):
+        channel = np.ascontiguousarray(padded[:, :, color])
+        result[:, :, color] = rank_filter_bands(channel, radius_rows, radius_cols, rank)
+    return result
+
+
+def median_filter(image, radius=1, border_type="reflect", constant_value=0):
+    return rank_filter(image, radius, 50, border_type, constant_value)
@@ -0,0 +1,34 @@
+import os
+
+import numpy as np
+import pytest
+
+from main import load_image
+from pipeline import Pipeline
+from tiling import open_bmp_memmap
+
+MAP_PATH = os.path.join(os.path.dirname(__file__), "Mapa_MD_no_terrain_low_res_Gray.bmp")
+
+
+@pytest.mark.parametrize("method", ["otsu", "mean", "p90"])
+def test_tiled_auto_threshold_matches_full_image(method):
+    image = load_image(MAP_PATH)
+    pipeline = Pipeline().threshold(method).erode(1).dilate(1)
+    expected = pipeline.run(image)
+    for tile_size in [(64, 64), (100, 37)]:
+        output = np.zeros_like(expected)
+        assert np.array_equal(pipeline.run_tiled(image, output, tile_size), expected)
+
+
+def test_bmp_auto_threshold_matches_full_image(tmp_path):
+    pipeline = Pipeline().threshold("otsu")
+    expected = pipeline.run(load_image(MAP_PATH))
+    output_path = tmp_path / "otsu.bmp"
+    pipeline.run_bmp(MAP_PATH, output_path, tile_size=(64, 64))
+    assert np.array_equal(open_bmp_memmap(output_path), expected)
+
+
+def test_tiled_auto_threshold_after_other_stage():
+    image = load_image(MAP_PATH)
+    with pytest.raises(ValueError):
+        Pipeline().erode(1).threshold("otsu").run_tiled(image, np.zeros_like(image))
@@ -0,0 +1,146 @@
+# tiling.py
+
+import struct
+
+import numpy as np
+
+from convolution_backends import kernel_padding
+from histogram import compute_histogram
+from morphology import split_radius
+from padding import as_pair, border_indices
+
+BMP_FILE_HEADER = struct.Struct("<2sIHHI")
+BMP_INFO_HEADER = struct.Struct("<IiiHHIIiiII")
+BI_RGB = 0  # bitmapa bez kompresji
+
+
+def row_stride(width, bytes_per_pixel):
+    # Wiersze w BMP są wyrównane do 4 bajtów
+    return (width * bytes_per_pixel + 3) & ~3
+
+
+def open_bmp_memmap(file_path, mode="r"):
+    with open(file_path, "rb") as file:
+        header = file.read(BMP_FILE_HEADER.size + BMP_INFO_HEADER.size)
+
+    signature, _, _, _, offset = BMP_FILE_HEADER.unpack_from(header)
+    (_, width, height, _, bits_per_pixel, compression,
+     _, _, _, _, _) = BMP_INFO_HEADER.unpack_from(header, BMP_FILE_HEADER.size)
+
+    if signature != b"BM":
+        raise ValueError(f"{file_path} nie jest plikiem BMP")
+    if compression != BI_RGB or bits_per_pixel not in (8, 24, 32):
+        raise ValueError(f"Obsługiwane są tylko nieskompresowane BMP 8/24/32-bitowe: {file_path}")
+
+    bytes_per_pixel = bits_per_pixel // 8
+    rows = abs(height)
+    raw = np.memmap(file_path, dtype=np.uint8, mode=mode, offset=offset,
+                    shape=(rows, row_stride(width, bytes_per_pixel)))
+    pixels = raw[:, :width * bytes_per_pixel]
+
+    # Dodatnia wysokość oznacza zapis od dolnego wiersza
+    if height > 0:
+        pixels = pixels[::-1]
+
+    # Dla 8 bitów zwracane są indeksy palety - tak samo jak np.array(Image.open(...)) w load_image()
+    if bytes_per_pixel == 1:
+        return pixels
+    # BGR(X) -> RGB, bez kopiowania danych
+    return pixels.reshape(rows, width, bytes_per_pixel)[:, :, 2::-1]
+
+
+def create_bmp_memmap(file_path, height, width, channels=1):
+    bytes_per_pixel = 1 if channels == 1 else 3
+    stride = row_stride(width, bytes_per_pixel)
+    palette = b""
+    if channels == 1:
+        # Paleta odcieni szarości, żeby indeksy były jasnościami pikseli
+        palette = b"".join(bytes((value, value, value, 0)) for value in range(256))
+
+    offset = BMP_FILE_HEADER.size + BMP_INFO_HEADER.size + len(palette)
+    image_size = stride * height
+    with open(file_path, "wb") as file:
+        file.write(BMP_FILE_HEADER.pack(b"BM", offset + image_size, 0, 0, offset))
+        file.write(BMP_INFO_HEADER.pack(BMP_INFO_HEADER.size, width, height, 1, 8 * bytes_per_pixel,
+                                        BI_RGB, image_size, 2835, 2835, 256 if channels == 1 else 0, 0))
+        file.write(palette)
+        file.truncate(offset + image_size)
+
+    return open_bmp_memmap(file_path, mode="r+")
+
+
+def read_tile(image, row_range, col_range, border_type="reflect", constant_value=0):
+    rows, cols = image.shape[:2]
+    row_indices, rows_inside = border_indices(*row_range, rows, border_type)
+    col_indices, cols_inside = border_indices(*col_range, cols, border_type)
+
+    # Z mapy pamięci czytane są tylko potrzebne wiersze i kolumny
+    tile = np.array(image[np.ix_(row_indices, col_indices)])
+    if rows_inside is not None:
+        tile[~rows_inside] = constant_value
+        tile[:, ~cols_inside] = constant_value
+    return tile
+
+
+def kernel_halo(mask):
+    return kernel_padding(np.asarray(mask))
+
+
+def radius_halo(radius):
+    return split_radius(radius)
+
+
+def tile_range(start, stop, before, after, size, border_type):
+    # Przy "wrap" zakładka za brzegiem obrazu pochodzi z jego drugiej strony. Pozostałe typy brzegu
+    # operacja dopełnia sama, więc kafelek przy krawędzi obrazu jest przycinany do niej - dzięki temu
+    # także łańcuchy kilku operacji dają na brzegu ten sam wynik co przetwarzanie całego obrazu
+    if border_type == "wrap":
+        return start - before, stop + after
+    return max(start - before, 0), min(stop + after, size)
+
+
+def tiled_histogram(image, band_rows=512):
+    # Histogram całego obrazu (także mapy pamięci) liczony pasami wierszy - bez wczytywania go w całości
+    histogram = [0] * 256
+    for row in range(0, image.shape[0], band_rows):
+        band = compute_histogram(np.ascontiguousarray(image[row:row + band_rows]))
+        histogram = [total + count for total, count in zip(histogram, band)]
+    return histogram
+
+
+def process_tiled(image, output, operation, halo=(0, 0), tile_size=(512, 512), border_type="reflect"):
+    # Każdy kafelek jest czytany z zakładką (halo) równą promieniowi maski lub elementu strukturalnego,
+    # a do wyniku trafia tylko jego środek, więc szwy między kafelkami są niewidoczne
+    rows, cols = image.shape[:2]
+    (top, bottom), (left, right) = as_pair(halo[0]), as_pair(halo[1])
+    tile_rows, tile_cols = tile_size
+
+    for row in range(0, rows, tile_rows):
+        row_end = min(row + tile_rows, rows)
+        row_range = tile_range(row, row_end, top, bottom, rows, border_type)
+        for col in range(0, cols, tile_cols):
+            col_end = min(col + tile_cols, cols)
+            col_range = tile_range(col, col_end, left, right, cols, border_type)
+
+            result = operation(read_tile(image, row_range, col_range, border_type))
+            row_offset, col_offset = row - row_range[0], col - col_range[0]
+            output[row:row_end, col:col_end] = result[row_offset:row_offset + row_end - row,
+                                                      col_offset:col_offset + col_end - col]
+
+    if isinstance(output, np.memmap):
+        output.flush()
+    return output
+
+
+def process_bmp_tiled(input_path, output_path, operation, halo=(0, 0), tile_size=(512, 512),
+                      border_type="reflect"):
+    image = open_bmp_memmap(input_path)
+    rows, cols = image.shape[:2]
+
+    # Liczba kanałów wyniku (np. binary_threshold() zamienia RGB na L) z pierwszego, małego kafelka
+    sample = operation(read_tile(image, (0, min(rows, 8)), (0, min(cols, 8))))
+    channels = 1 if sample.ndim == 2 else sample.shape[2]
+
+    output = create_bmp_memmap(output_path, rows, cols, channels)
+    process_tiled(image, output, operation, halo, tile_size, border_type)
+    return output
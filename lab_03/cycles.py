@@ -0,0 +1,102 @@
+# cycles.py
+
+import hashlib
+
+import numpy as np
+
+from packed_automaton import PackedAutomaton, unpack_states
+
+# Liczba pokoleń liczonych naraz między sprawdzeniami
+CHUNK_GENERATIONS = 1024
+# Górne ograniczenia poszukiwań: liczba pokoleń i pamięć na zapamiętaną trajektorię
+MAX_GENERATIONS = 1 << 20
+MAX_TRAJECTORY_BYTES = 1 << 30
+
+
+class Trajectory:
+    # Pokolenia 0..transient + period - 1 w postaci spakowanej; każde dalsze pokolenie n jest równe
+    # pokoleniu transient + (n - transient) % period, więc stan po dowolnej liczbie kroków to jeden odczyt
+    def __init__(self, packed, width, transient, period):
+        self.packed = packed
+        self.width = width
+        self.transient = transient
+        self.period = period
+
+    def index(self, generation):
+        generation = np.asarray(generation)
+        wrapped = self.transient + (generation - self.transient) % self.period
+        return np.where(generation < self.transient, generation, wrapped)
+
+    def packed_state(self, generation):
+        return self.packed[int(self.index(generation))]
+
+    def state(self, generation):
+        return unpack_states(self.packed_state(generation), self.width)
+
+    def states(self, start, stop):
+        return unpack_states(self.packed[self.index(np.arange(start, stop))], self.width)
+
+
+class CycleDetector:
+    # Przyjmuje kolejne spakowane pokolenia i zapamiętuje tylko ich skróty, razem z fazą listy reguł
+    # (j % len(rules)) - ten sam stan z inną regułą w kolejnym kroku nie zamyka cyklu. Zgodność skrótów
+    # jest potwierdzana porównaniem ze stanem zwróconym przez read_row(generation), więc źródło pokoleń
+    # (pamięć albo plik ze SpacetimeWriter) decyduje, gdzie trzymana jest trajektoria
+    def __init__(self, rule_count, read_row, max_generations=MAX_GENERATIONS):
+        self.rule_count = rule_count
+        self.read_row = read_row
+        self.max_generations = max_generations
+        self.seen = {}
+        self.generation = 0
+        self.transient = None
+        self.period = None
+
+    @property
+    def done(self):
+        return self.period is not None or self.generation >= self.max_generations
+
+    def add(self, rows):
+        for row in rows:
+            if self.done:
+                return
+            key = (self.generation % self.rule_count, hashlib.blake2b(row.tobytes(), digest_size=16).digest())
+            for previous in self.seen.get(key, ()):
+                if np.array_equal(self.read_row(previous), row):
+                    self.transient, self.period = previous, self.generation - previous
+                    self.seen.clear()
+                    return
+            self.seen.setdefault(key, []).append(self.generation)
+            self.generation += 1
+
+
+def find_cycle(initial_state, rules, boundary="periodic", max_generations=MAX_GENERATIONS):
+    # Zwraca Trajectory albo None, jeśli cykl nie pojawił się w max_generations pokoleniach
+    engine = PackedAutomaton(initial_state, rules, boundary)
+    max_generations = min(max_generations, MAX_TRAJECTORY_BYTES // (8 * len(engine.words)))
+    chunks = [engine.words[np.newaxis].copy()]
+    detector = CycleDetector(len(engine.rules), lambda generation: state_row(chunks, generation), max_generations)
+
+    while True:
+        detector.add(chunks[-1])
+        if detector.period is not None:
+            packed = np.concatenate(chunks)[:detector.transient + detector.period]
+            return Trajectory(packed, engine.width, detector.transient, detector.period)
+        if detector.done:
+            return None
+        chunks.append(engine.history(min(CHUNK_GENERATIONS, max_generations - detector.generation))[1:])
+
+
+def state_row(chunks, generation):
+    for chunk in chunks:
+        if generation < len(chunk):
+            return chunk[generation]
+        generation -= len(chunk)
+    raise IndexError(generation)
+
+
+def state_after(initial_state, rules, iterations, boundary="periodic", max_generations=MAX_GENERATIONS):
+    # Stan po iterations krokach: z wykrytego cyklu, a gdy cyklu brak - zwykłym liczeniem
+    trajectory = find_cycle(initial_state, rules, boundary, min(max_generations, iterations + 1))
+    if trajectory is not None:
+        return trajectory.state(iterations), trajectory
+    return PackedAutomaton(initial_state, rules, boundary).advance(iterations).state(), None
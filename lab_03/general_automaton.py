@@ -0,0 +1,118 @@
+# general_automaton.py
+
+import numpy as np
+
+
+def index_dtype(size):
+    # Najmniejszy typ mieszczący indeksy tablicy reguły - tablice indeksów mają rozmiar całego stanu
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if size <= np.iinfo(dtype).max + 1:
+            return dtype
+    return np.uint64
+
+
+# Poniżej tylu cyfr numer reguły jest zamieniany zwykłym dzieleniem przez k
+LEAF_DIGITS = 64
+
+
+def split_digits(number, k, digits):
+    # Dzielenie przez k^(połowa cyfr) i rekurencja dla obu połówek: każdy poziom dzieli liczby o łącznie
+    # tej samej długości, zamiast size razy dzielić przez k całą wielką liczbę
+    size = len(digits)
+    if size <= LEAF_DIGITS:
+        for index in range(size):
+            number, digits[index] = divmod(number, k)
+        return
+    half = size // 2
+    high, low = divmod(number, k ** half)
+    split_digits(low, k, digits[:half])
+    split_digits(high, k, digits[half:])
+
+
+def rule_digits(number, k, size):
+    # Cyfry numeru reguły w systemie o podstawie k, od najmniej znaczącej - wpis i to wynik dla indeksu i
+    if not 0 <= number < k ** size:
+        raise ValueError(f"Numer reguły jest zbyt duży dla {size} wpisów")
+    digits = np.zeros(size, dtype=np.uint8)
+    split_digits(number, k, digits)
+    return digits
+
+
+class TableRule:
+    # Reguła jako tablica: dla sąsiedztwa 2r + 1 komórek o k stanach indeksem jest liczba o cyfrach
+    # kolejnych komórek (skrajna lewa najbardziej znacząca, jak 4l + 2c + r w compute_new_state()),
+    # a dla reguły totalistycznej - suma stanów w sąsiedztwie
+    def __init__(self, table, k=2, radius=1, totalistic=False):
+        self.table = np.asarray(table, dtype=np.uint8)
+        self.k = k
+        self.radius = radius
+        self.totalistic = totalistic
+        size = (2 * radius + 1) * (k - 1) + 1 if totalistic else k ** (2 * radius + 1)
+        if len(self.table) != size:
+            raise ValueError(f"Tablica reguły musi mieć {size} wpisów")
+        if self.table.max(initial=0) >= k:
+            raise ValueError(f"Stany w tablicy reguły muszą być mniejsze niż k={k}")
+        self.dtype = index_dtype(size)
+
+    def indices(self, padded, width):
+        # Indeksy tablicy dla całego stanu naraz: schemat Hornera (albo suma) po przesuniętych widokach
+        indices = np.zeros(width, dtype=self.dtype)
+        for offset in range(2 * self.radius + 1):
+            if not self.totalistic:
+                indices *= self.dtype(self.k)
+            indices += padded[offset:offset + width]
+        return indices
+
+    def apply(self, padded, width):
+        return self.table[self.indices(padded, width)]
+
+
+def wolfram_rule(number, k=2, radius=1):
+    # Numer reguły w notacji Wolframa; elementary_rule(n) = wolfram_rule(n) to reguły z lab_03
+    return TableRule(rule_digits(number, k, k ** (2 * radius + 1)), k, radius)
+
+
+def totalistic_rule(code, k=2, radius=1):
+    return TableRule(rule_digits(code, k, (2 * radius + 1) * (k - 1) + 1), k, radius, totalistic=True)
+
+
+def elementary_rule(number):
+    return wolfram_rule(number)
+
+
+def as_table_rule(rule):
+    return rule if isinstance(rule, TableRule) else elementary_rule(rule)
+
+
+class GeneralAutomaton:
+    # Automat 1D o k stanach z listą reguł stosowanych cyklicznie (jak w automaton()); boundary:
+    # "periodic" albo dowolna inna wartość - komórki spoza stanu mają stan 0 ("absorbing")
+    def __init__(self, initial_state, rules, boundary="periodic"):
+        self.rules = [as_table_rule(rule) for rule in rules]
+        self.state = np.asarray(initial_state, dtype=np.uint8).copy()
+        if self.state.max(initial=0) >= min(rule.k for rule in self.rules):
+            raise ValueError("Stan początkowy zawiera stany spoza zakresu reguł")
+        self.width = len(self.state)
+        self.boundary = boundary
+        self.pad_mode = "wrap" if boundary == "periodic" else "constant"
+        self.generation = 0
+
+    def step(self):
+        rule = self.rules[self.generation % len(self.rules)]
+        padded = np.pad(self.state, rule.radius, mode=self.pad_mode)
+        self.state = rule.apply(padded, self.width)
+        self.generation += 1
+        return self.state
+
+    def advance(self, count=1):
+        for _ in range(count):
+            self.step()
+        return self
+
+    def history(self, count):
+        # Bieżący stan i count kolejnych pokoleń, po jednym wierszu na pokolenie
+        history = np.empty((count + 1, self.width), dtype=np.uint8)
+        history[0] = self.state
+        for j in range(count):
+            history[j + 1] = self.step()
+        return history
@@ -3,6 +3,15 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.colors import ListedColormap
 
+from cycles import find_cycle, state_after
+from general_automaton import GeneralAutomaton
+from packed_automaton import PackedAutomaton, unpack_states
+from render import render_spacetime
+from spacetime import export_csv, stream_automaton
+
+# Powyżej tylu komórek lub pokoleń diagram jest tylko zapisywany do PNG, bez okna matplotlib
+VISUALIZE_MAX_SIZE = 300
+
 
 def handle_border(state, i, boundary):
     if boundary == "periodic":
@@ -38,11 +47,36 @@ def compute_new_state(cell, left, right, rule):
     return rule[index]
 
 
-def automaton(initial_state, rules, iterations, boundary="periodic"):
+def automaton(initial_state, rules, iterations, boundary="periodic", method="packed", output=None,
+              detect_cycles=False):
     if boundary == "periodic":
         print("Ustawiono warunek brzegowy 'periodic'.")
     else:
         print("Ustawiono warunek brzegowy 'absorbing'.")
+
+    # Z podaną ścieżką output pokolenia są zapisywane do pliku na bieżąco (spacetime.py),
+    # a zwracany jest obiekt Spacetime do odczytu dowolnych zakresów pokoleń (z detect_cycles=True także
+    # z transient i period wykrytymi w tym samym przebiegu)
+    if output is not None:
+        return stream_automaton(initial_state, rules, iterations, output, boundary, detect_cycles=detect_cycles)
+
+    # method: "packed" (64 komórki na słowo uint64, packed_automaton.py), "cycle" (jak "packed", ale po
+    # wykryciu cyklu kolejne pokolenia są odczytywane z niego zamiast liczone, cycles.py; sam stan końcowy
+    # bez listy pokoleń daje automaton_cycle()), "table" (reguły jako tablice, także k-stanowe
+    # i totalistyczne, general_automaton.py) lub "python"
+    dtype = np.asarray(initial_state).dtype
+    if method == "table":
+        history = GeneralAutomaton(initial_state, rules, boundary).history(iterations)
+        return list(history.astype(dtype))
+    if method == "cycle":
+        trajectory = find_cycle(initial_state, rules, boundary, iterations + 1)
+        if trajectory is not None:
+            return list(trajectory.states(0, iterations + 1).astype(dtype))
+
+    if method != "python":
+        history = PackedAutomaton(initial_state, rules, boundary).history(iterations)
+        return list(unpack_states(history, len(initial_state)).astype(dtype))
+
     states = [initial_state.copy()]
     rule_sets = [rule_to_bin(r) for r in rules]
 
@@ -60,6 +94,13 @@ def automaton(initial_state, rules, iterations, boundary="periodic"):
     return states
 
 
+def automaton_cycle(initial_state, rules, iterations, boundary="periodic"):
+    # Zwraca (stan po iterations krokach, Trajectory z transient i period albo None, gdy cyklu nie wykryto)
+    # - bez listy pokoleń, więc pamięć nie zależy od liczby iteracji
+    state, trajectory = state_after(initial_state, rules, iterations, boundary)
+    return state.astype(np.asarray(initial_state).dtype), trajectory
+
+
 def save_to_csv(states, filename="automaton_output.csv"):
     df = pd.DataFrame(states)
     df.to_csv(filename, index=False, header=False)
@@ -128,13 +169,21 @@ def main():
 
     boundary_type = input("Wybierz warunek brzegowy (periodic/absorbing): ").strip().lower()
 
-    states = automaton(initial_state, rules, iterations, boundary_type)
+    spacetime = automaton(initial_state, rules, iterations, boundary_type, output="automaton_output.bin",
+                          detect_cycles=True)
+
+    export_csv(spacetime, "automaton_output.csv")
+
+    if spacetime.period is not None:
+        print(f"Stan powtarza się z okresem {spacetime.period} od pokolenia {spacetime.transient}.")
 
-    save_to_csv(states)
+    print(f"Wynik zapisano w plikach automaton_output.bin i automaton_output.csv")
 
-    print(f"Wynik zapisano w pliku automaton_output.csv")
+    render_spacetime(spacetime, "automaton_output.png")
+    print("Diagram zapisano w pliku automaton_output.png")
 
-    visualize_grid(np.array(states))
+    if max(len(spacetime), spacetime.width) <= VISUALIZE_MAX_SIZE:
+        visualize_grid(spacetime.read())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,66 @@
+# numba_kernels.py
+# Jądra numba dla packed_automaton.py - moduł jest importowany tylko wtedy, gdy pakiet numba jest dostępny
+
+import numpy as np
+from numba import njit
+
+
+@njit
+def select(condition, ones, zeros):
+    return (condition & ones) | (~condition & zeros)
+
+
+@njit
+def step_words(words, out, masks, width, periodic, last_mask):
+    # Nowe pokolenie dla 64 komórek naraz: reguła jako drzewo multiplekserów po bitach r, c, l
+    n = len(words)
+    one = np.uint64(1)
+    last_bit = np.uint64((width - 1) % 64)
+    for i in range(n):
+        word = words[i]
+        if i > 0:
+            carry_left = words[i - 1] >> np.uint64(63)
+        elif periodic:
+            carry_left = (words[n - 1] >> last_bit) & one
+        else:
+            carry_left = np.uint64(0)
+        if i < n - 1:
+            carry_right = words[i + 1] << np.uint64(63)
+        elif periodic:
+            carry_right = (words[0] & one) << last_bit
+        else:
+            carry_right = np.uint64(0)
+
+        left = (word << one) | carry_left
+        right = (word >> one) | carry_right
+
+        low_0 = select(right, masks[1], masks[0])
+        low_1 = select(right, masks[3], masks[2])
+        high_0 = select(right, masks[5], masks[4])
+        high_1 = select(right, masks[7], masks[6])
+        low = select(word, low_1, low_0)
+        high = select(word, high_1, high_0)
+        out[i] = select(left, high, low)
+    out[n - 1] &= last_mask
+
+
+@njit
+def run_words(words, masks, generation, count, width, periodic, last_mask):
+    # count pokoleń bez zapisywania stanów pośrednich; reguła pokolenia j to masks[j % len(masks)]
+    current = words.copy()
+    following = np.empty_like(words)
+    for j in range(generation, generation + count):
+        step_words(current, following, masks[j % len(masks)], width, periodic, last_mask)
+        current, following = following, current
+    return current
+
+
+@njit
+def run_words_recorded(words, masks, generation, count, width, periodic, last_mask):
+    # Jak run_words, ale z zapisem wszystkich pokoleń (wiersz 0 to stan początkowy)
+    history = np.empty((count + 1, len(words)), dtype=np.uint64)
+    history[0] = words
+    for j in range(count):
+        step_words(history[j], history[j + 1], masks[(generation + j) % len(masks)], width, periodic,
+                   last_mask)
+    return history
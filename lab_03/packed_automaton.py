@@ -0,0 +1,131 @@
+# packed_automaton.py
+
+import numpy as np
+
+WORD_BITS = 64
+ALL_ONES = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def pack_state(state):
+    # Komórka i to bit i % 64 słowa i // 64; bity powyżej szerokości ostatniego słowa są zerami
+    bits = np.asarray(state, dtype=np.uint8)
+    words = -(-len(bits) // WORD_BITS)
+    packed = np.zeros(words * 8, dtype=np.uint8)
+    packed[:-(-len(bits) // 8)] = np.packbits(bits, bitorder="little")
+    return packed.view("<u8").astype(np.uint64)
+
+
+def unpack_states(words, width):
+    # Działa dla jednego stanu (1D) i dla wielu pokoleń naraz (2D, pokolenie na wiersz)
+    words = np.ascontiguousarray(words, dtype="<u8")
+    bits = np.unpackbits(words.view(np.uint8), axis=-1, bitorder="little")
+    return bits[..., :width]
+
+
+def rule_masks(rules):
+    # Lista reguł jest stosowana krok po kroku. Złożenie okresu L reguł w jedną regułę o promieniu L
+    # (tablica bloków 2^(blok + 2L) wpisów) mierzone na 10^6 komórek było 6-13x wolniejsze niż L kroków
+    # na słowach, które i tak liczą 64 komórki w ok. 20 operacjach - dlatego nie jest używane
+    # Dla każdej reguły 8 masek: same jedynki, jeśli reguła daje 1 dla sąsiedztwa (l, c, r) = k
+    # (k = 4l + 2c + r, czyli bit k numeru reguły - tak jak compute_new_state())
+    masks = np.zeros((len(rules), 8), dtype=np.uint64)
+    for index, rule in enumerate(rules):
+        for k in range(8):
+            if (rule >> k) & 1:
+                masks[index, k] = ALL_ONES
+    return masks
+
+
+def last_word_mask(width):
+    used = width % WORD_BITS
+    if used == 0:
+        return ALL_ONES
+    return np.uint64((1 << used) - 1)
+
+
+def select(condition, ones, zeros):
+    return (condition & ones) | (~condition & zeros)
+
+
+def step_words(words, masks, width, periodic, last_mask):
+    # To samo drzewo multiplekserów co numba_kernels.step_words(), ale dla wszystkich słów naraz
+    one = np.uint64(1)
+    last_bit = np.uint64((width - 1) % 64)
+    carry_left = np.zeros_like(words)
+    carry_right = np.zeros_like(words)
+    carry_left[1:] = words[:-1] >> np.uint64(63)
+    carry_right[:-1] = words[1:] << np.uint64(63)
+    if periodic:
+        carry_left[0] = (words[-1] >> last_bit) & one
+        carry_right[-1] = (words[0] & one) << last_bit
+
+    left = (words << one) | carry_left
+    right = (words >> one) | carry_right
+
+    low_0 = select(right, masks[1], masks[0])
+    low_1 = select(right, masks[3], masks[2])
+    high_0 = select(right, masks[5], masks[4])
+    high_1 = select(right, masks[7], masks[6])
+    low = select(words, low_1, low_0)
+    high = select(words, high_1, high_0)
+    out = select(left, high, low)
+    out[-1] &= last_mask
+    return out
+
+
+def run_words(words, masks, generation, count, width, periodic, last_mask):
+    current = words.copy()
+    for j in range(generation, generation + count):
+        current = step_words(current, masks[j % len(masks)], width, periodic, last_mask)
+    return current
+
+
+def run_words_recorded(words, masks, generation, count, width, periodic, last_mask):
+    history = np.empty((count + 1, len(words)), dtype=np.uint64)
+    history[0] = words
+    for j in range(count):
+        history[j + 1] = step_words(history[j], masks[(generation + j) % len(masks)], width, periodic,
+                                    last_mask)
+    return history
+
+
+def word_kernels():
+    # Jądra numba, jeśli pakiet jest zainstalowany; bez niego te same operacje na słowach w NumPy
+    # (pokolenie po pokoleniu, wolniej dla krótkich stanów)
+    try:
+        import numba_kernels
+    except ImportError:
+        return run_words, run_words_recorded
+    return numba_kernels.run_words, numba_kernels.run_words_recorded
+
+
+class PackedAutomaton:
+    # Automat elementarny przechowujący stan jako słowa uint64; boundary jak w handle_border():
+    # "periodic" albo dowolna inna wartość - komórki spoza stanu są zerami ("absorbing")
+    def __init__(self, initial_state, rules, boundary="periodic"):
+        self.width = len(initial_state)
+        self.rules = list(rules)
+        self.boundary = boundary
+        self.periodic = boundary == "periodic"
+        self.masks = rule_masks(self.rules)
+        self.last_mask = last_word_mask(self.width)
+        self.words = pack_state(initial_state)
+        self.generation = 0
+        self.run_words, self.run_words_recorded = word_kernels()
+
+    def state(self):
+        return unpack_states(self.words, self.width)
+
+    def advance(self, count=1):
+        self.words = self.run_words(self.words, self.masks, self.generation, count, self.width,
+                                    self.periodic, self.last_mask)
+        self.generation += count
+        return self
+
+    def history(self, count):
+        # Bieżący stan i count kolejnych pokoleń w postaci spakowanej, po jednym wierszu na pokolenie
+        history = self.run_words_recorded(self.words, self.masks, self.generation, count, self.width,
+                                          self.periodic, self.last_mask)
+        self.words = history[-1].copy()
+        self.generation += count
+        return history
@@ -0,0 +1,66 @@
+# render.py
+
+import numpy as np
+from PIL import Image
+
+# Te same kolory co w visualize_grid(): 0 - biały, 1 - pomarańczowy, siatka czarna
+DEAD_COLOR = np.array([255, 255, 255], dtype=np.float64)
+ALIVE_COLOR = np.array([255, 102, 0], dtype=np.float64)
+GRID_COLOR = (0, 0, 0)
+# Linie siatki są rysowane dopiero wtedy, gdy komórka ma co najmniej tyle pikseli
+GRID_MIN_CELL = 8
+MAX_CELL_SIZE = 32
+MAX_SIZE = (4096, 4096)
+CHUNK_GENERATIONS = 1024
+
+
+def block_density(states, row_factor, col_factor):
+    # Udział jedynek w blokach row_factor x col_factor (ostatnie bloki mogą być mniejsze)
+    rows, cols = states.shape
+    row_starts = np.arange(0, rows, row_factor)
+    col_starts = np.arange(0, cols, col_factor)
+    sums = np.add.reduceat(states, col_starts, axis=1, dtype=np.uint32)
+    sums = np.add.reduceat(sums, row_starts, axis=0)
+    row_counts = np.diff(np.append(row_starts, rows))
+    col_counts = np.diff(np.append(col_starts, cols))
+    return sums / np.outer(row_counts, col_counts)
+
+
+def colorize(density):
+    # Gęstość 0..1 na kolor pośredni między kolorem komórki martwej i żywej
+    return (DEAD_COLOR + density[..., np.newaxis] * (ALIVE_COLOR - DEAD_COLOR)).round().astype(np.uint8)
+
+
+def render_spacetime(spacetime, path, max_size=MAX_SIZE, start=0, stop=None):
+    # Diagram pokoleń start..stop - 1 zapisany wprost do pliku PNG, czytany z pliku kawałkami (Spacetime).
+    # Gdy diagram jest większy niż max_size (szerokość, wysokość), piksel to blok komórek w kolorze
+    # zależnym od gęstości; gdy mniejszy, komórka to kwadrat cell_size x cell_size pikseli
+    stop = len(spacetime) if stop is None else min(stop, len(spacetime))
+    rows, cols = stop - start, spacetime.width
+    max_width, max_height = max_size
+    row_factor = -(-rows // max_height)
+    col_factor = -(-cols // max_width)
+
+    if row_factor > 1 or col_factor > 1:
+        # Obie osie w tej samej skali, żeby nie zniekształcać diagramu
+        factor = max(row_factor, col_factor)
+        image = np.empty((-(-rows // factor), -(-cols // factor), 3), dtype=np.uint8)
+        chunk = factor * max(1, CHUNK_GENERATIONS // factor)
+        for index, states in enumerate(spacetime.chunks(start, stop, chunk)):
+            top = index * chunk // factor
+            density = block_density(states, factor, factor)
+            image[top:top + len(density)] = colorize(density)
+        Image.fromarray(image).save(path)
+        return image.shape[:2]
+
+    cell_size = max(1, min(max_width // cols, max_height // rows, MAX_CELL_SIZE))
+    grid = cell_size >= GRID_MIN_CELL
+    colors = colorize(spacetime.read(start, stop).astype(np.float64))
+    image = colors.repeat(cell_size, axis=0).repeat(cell_size, axis=1)
+    if grid:
+        # Linia na górnej i lewej krawędzi każdej komórki oraz zamykająca na dole i z prawej
+        image = np.pad(image, ((0, 1), (0, 1), (0, 0)))
+        image[::cell_size, :] = GRID_COLOR
+        image[:, ::cell_size] = GRID_COLOR
+    Image.fromarray(image).save(path)
+    return image.shape[:2]
@@ -0,0 +1,127 @@
+# spacetime.py
+
+import struct
+
+import numpy as np
+
+from cycles import CycleDetector
+from packed_automaton import PackedAutomaton, unpack_states
+
+# Nagłówek: znacznik, wersja, szerokość, liczba słów na pokolenie, liczba pokoleń, czy periodyczny,
+# liczba reguł; po nim reguły (uint32) i wyrównanie do 8 bajtów, a dalej pokolenia jako wiersze słów uint64
+MAGIC = b"CA1D"
+VERSION = 1
+HEADER_FORMAT = "<4sIQQQII"
+GENERATIONS_OFFSET = struct.calcsize("<4sIQQ")
+# Liczba pokoleń liczonych naraz przed zapisem - ogranicza pamięć niezależnie od liczby iteracji
+CHUNK_GENERATIONS = 1024
+
+
+def header_size(rule_count):
+    size = struct.calcsize(HEADER_FORMAT) + 4 * rule_count
+    return -(-size // 8) * 8
+
+
+class SpacetimeWriter:
+    # Zapisuje pokolenia na bieżąco, w postaci spakowanej (64 komórki na słowo)
+    def __init__(self, path, width, rules, boundary="periodic"):
+        self.path = path
+        self.width = width
+        self.rules = list(rules)
+        self.periodic = boundary == "periodic"
+        self.words = -(-width // 64)
+        self.generations = 0
+        self.file = open(path, "w+b")
+        self.write_header()
+        self.file.write(b"\0" * (header_size(len(self.rules)) - self.file.tell()))
+
+    def write_header(self):
+        self.file.write(struct.pack(HEADER_FORMAT, MAGIC, VERSION, self.width, self.words, self.generations,
+                                    int(self.periodic), len(self.rules)))
+        self.file.write(struct.pack(f"<{len(self.rules)}I", *self.rules))
+
+    def write(self, packed):
+        # packed: jedno pokolenie (1D) albo blok pokoleń (2D) z PackedAutomaton
+        packed = np.ascontiguousarray(packed, dtype="<u8").reshape(-1, self.words)
+        self.file.write(packed.tobytes())
+        self.generations += len(packed)
+
+    def read_row(self, generation):
+        # Zapisane już pokolenie, odczytane z pliku (np. do potwierdzenia cyklu w CycleDetector)
+        # (seek/read zamiast os.pread, które nie istnieje w Windows; potem powrót na koniec pliku)
+        self.file.flush()
+        position = self.file.tell()
+        self.file.seek(header_size(len(self.rules)) + 8 * self.words * generation)
+        row = np.frombuffer(self.file.read(8 * self.words), dtype="<u8")
+        self.file.seek(position)
+        return row
+
+    def close(self):
+        # Liczba pokoleń jest znana dopiero na końcu, więc nagłówek jest uzupełniany przy zamknięciu
+        self.file.seek(GENERATIONS_OFFSET)
+        self.file.write(struct.pack("<Q", self.generations))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class Spacetime:
+    # Odczyt pliku z SpacetimeWriter przez np.memmap - wczytywane są tylko wybrane pokolenia
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            fields = struct.unpack(HEADER_FORMAT, file.read(struct.calcsize(HEADER_FORMAT)))
+            magic, version, self.width, self.words, self.generations, periodic, rule_count = fields
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} nie jest plikiem automatu (wersja {VERSION})")
+            self.rules = list(struct.unpack(f"<{rule_count}I", file.read(4 * rule_count)))
+        self.boundary = "periodic" if periodic else "absorbing"
+        # Wypełniane przez stream_automaton(..., detect_cycles=True), jeśli stan się powtórzył
+        self.transient = None
+        self.period = None
+        self.packed = np.memmap(path, dtype="<u8", mode="r", offset=header_size(rule_count),
+                                shape=(self.generations, self.words))
+
+    def __len__(self):
+        return self.generations
+
+    def read(self, start=0, stop=None):
+        # Pokolenia start..stop - 1 jako tablica zer i jedynek (uint8)
+        return unpack_states(self.packed[start:stop], self.width)
+
+    def chunks(self, start=0, stop=None, size=CHUNK_GENERATIONS):
+        stop = self.generations if stop is None else min(stop, self.generations)
+        for chunk_start in range(start, stop, size):
+            yield self.read(chunk_start, min(chunk_start + size, stop))
+
+
+def stream_automaton(initial_state, rules, iterations, path, boundary="periodic", chunk=CHUNK_GENERATIONS,
+                     detect_cycles=False):
+    # Jak automaton(), ale pokolenia trafiają do pliku w miarę liczenia zamiast do listy w pamięci.
+    # Z detect_cycles=True zapisywane pokolenia są też sprawdzane przez CycleDetector (w tym samym
+    # przebiegu, trajektoria jest czytana z pliku), a wynik trafia do transient i period
+    engine = PackedAutomaton(initial_state, rules, boundary)
+    with SpacetimeWriter(path, len(initial_state), rules, boundary) as writer:
+        detector = CycleDetector(len(engine.rules), writer.read_row) if detect_cycles else None
+        writer.write(engine.words)
+        if detector is not None:
+            detector.add(engine.words[np.newaxis])
+        for done in range(0, iterations, chunk):
+            block = engine.history(min(chunk, iterations - done))[1:]
+            writer.write(block)
+            if detector is not None:
+                detector.add(block)
+    spacetime = Spacetime(path)
+    if detector is not None:
+        spacetime.transient, spacetime.period = detector.transient, detector.period
+    return spacetime
+
+
+def export_csv(spacetime, filename="automaton_output.csv", start=0, stop=None):
+    # Ten sam format co save_to_csv(), zapisywany po kawałku
+    with open(filename, "w") as file:
+        for chunk in spacetime.chunks(start, stop):
+            np.savetxt(file, chunk, fmt="%d", delimiter=",")
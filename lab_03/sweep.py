@@ -0,0 +1,203 @@
+# sweep.py
+
+import argparse
+import itertools
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from cycles import find_cycle
+from packed_automaton import PackedAutomaton, unpack_states
+
+CHUNK_GENERATIONS = 1024
+# Wyniki są zapisywane co tyle zakończonych przebiegów (i zawsze na końcu) jako kolejna część
+FLUSH_EVERY = 64
+# Najwięcej tylu zleconych, a nieodebranych przebiegów na proces
+IN_FLIGHT_PER_WORKER = 2
+KEY_COLUMNS = ("rules", "seed", "width", "boundary", "iterations", "block_size")
+SHARD_PATTERN = "part-{:05d}.npz"
+
+
+def rules_key(rules):
+    return "-".join(str(rule) for rule in rules)
+
+
+def initial_state(seed, width):
+    return np.random.default_rng(seed).integers(0, 2, size=width)
+
+
+def densities(packed, width):
+    return unpack_states(packed, width).sum(axis=-1) / width
+
+
+def block_entropy(state, block_size, periodic):
+    # Entropia Shannona (w bitach) rozkładu bloków block_size kolejnych komórek
+    if periodic:
+        state = np.concatenate([state, state[:block_size - 1]])
+    weights = 1 << np.arange(block_size)
+    codes = np.lib.stride_tricks.sliding_window_view(state, block_size) @ weights
+    counts = np.bincount(codes, minlength=1 << block_size)
+    probabilities = counts[counts > 0] / counts.sum()
+    return float(-(probabilities * np.log2(probabilities)).sum())
+
+
+def run_job(rules, seed, width, boundary, iterations, block_size):
+    state = initial_state(seed, width)
+    trajectory = find_cycle(state, rules, boundary, iterations + 1)
+    if trajectory is not None:
+        # Gęstości tylko dla pokoleń do końca pierwszego okresu - dalej się powtarzają
+        density = densities(trajectory.packed, width)[trajectory.index(np.arange(iterations + 1))]
+        final_state = trajectory.state(iterations)
+        transient, period = trajectory.transient, trajectory.period
+    else:
+        engine = PackedAutomaton(state, rules, boundary)
+        density = [densities(engine.words, width)]
+        for done in range(0, iterations, CHUNK_GENERATIONS):
+            density.append(densities(engine.history(min(CHUNK_GENERATIONS, iterations - done))[1:], width))
+        density = np.hstack(density)
+        final_state = engine.state()
+        transient = period = -1
+
+    return {
+        "rules": rules_key(rules),
+        "seed": seed,
+        "width": width,
+        "boundary": boundary,
+        "iterations": iterations,
+        "block_size": block_size,
+        "density": density.astype(np.float32),
+        "final_density": float(density[-1]),
+        "block_entropy": block_entropy(final_state, block_size, boundary == "periodic"),
+        "transient": transient,
+        "period": period,
+    }
+
+
+def shard_paths(directory):
+    # Części wyników w kolejności zapisu (pusta lista, gdy katalogu jeszcze nie ma)
+    if not os.path.isdir(directory):
+        return []
+    names = sorted(name for name in os.listdir(directory) if name.startswith("part-") and name.endswith(".npz")
+                   and not name.endswith(".tmp.npz"))
+    return [os.path.join(directory, name) for name in names]
+
+
+def load_results(directory, columns=None):
+    # Wiersze ze wszystkich części; columns ogranicza odczyt do wybranych kolumn
+    # (np. KEY_COLUMNS przy wznawianiu - bez wczytywania gęstości)
+    rows = []
+    for path in shard_paths(directory):
+        with np.load(path) as data:
+            shard = {name: data[name] for name in (columns or data.files)}
+        for index in range(len(shard["seed"])):
+            row = {name: values[index] for name, values in shard.items()}
+            if "density" in row:
+                row["density"] = row["density"][:row["iterations"] + 1]
+            rows.append(row)
+    return rows
+
+
+def save_results(directory, rows):
+    # Nowa część wyników - plik kolumnowy .npz z jedną tablicą na kolumnę; przebiegi o różnej liczbie
+    # iteracji są dopełniane NaN. Wcześniejsze części nie są przepisywane, więc koszt zapisu jest
+    # proporcjonalny do nowych wierszy. Zapis do pliku tymczasowego i podmiana - przerwany zapis nie psuje wyników
+    os.makedirs(directory, exist_ok=True)
+    length = max(len(row["density"]) for row in rows)
+    density = np.full((len(rows), length), np.nan, dtype=np.float32)
+    for index, row in enumerate(rows):
+        density[index, :len(row["density"])] = row["density"]
+
+    columns = {name: np.array([row[name] for row in rows]) for name in rows[0] if name != "density"}
+    existing = shard_paths(directory)
+    number = int(os.path.basename(existing[-1])[5:-4]) + 1 if existing else 0
+    path = os.path.join(directory, SHARD_PATTERN.format(number))
+    temporary = path[:-len(".npz")] + ".tmp.npz"
+    np.savez(temporary, density=density, **columns)
+    os.replace(temporary, path)
+    return path
+
+
+def job_key(rules, seed, width, boundary, iterations, block_size):
+    # Ten sam klucz dla zadania i dla wiersza wczytanego z pliku (reguły zapisane jako tekst)
+    if not isinstance(rules, str):
+        rules = rules_key(rules)
+    return rules, int(seed), int(width), str(boundary), int(iterations), int(block_size)
+
+
+def run_sweep(rule_sets, seeds, widths, boundaries, iterations, output, block_size=3, workers=None,
+              flush_every=FLUSH_EVERY):
+    # Wyniki w katalogu output jako kolejne części; w pamięci są tylko wiersze czekające na zapis.
+    # Zwraca liczbę przebiegów zapisanych w tym wywołaniu
+    done = {job_key(*(row[name] for name in KEY_COLUMNS)) for row in load_results(output, KEY_COLUMNS)}
+    jobs = [job for job in itertools.product(rule_sets, seeds, widths, boundaries)
+            if job_key(*job, iterations, block_size) not in done]
+    print(f"Przebiegów do wykonania: {len(jobs)} (pominięto zapisane: {len(done)})")
+
+    # Zlecane jest najwyżej IN_FLIGHT_PER_WORKER przebiegów na proces, kolejne dopiero po odebraniu wyników;
+    # odebrane Future nie są nigdzie przechowywane, więc wynik żyje tylko do zapisania części
+    remaining = iter(jobs)
+    limit = IN_FLIGHT_PER_WORKER * (workers or os.cpu_count() or 1)
+    pending = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        def submit(count):
+            return {executor.submit(run_job, rules, seed, width, boundary, iterations, block_size)
+                    for rules, seed, width, boundary in itertools.islice(remaining, count)}
+
+        running = submit(limit)
+        while running:
+            finished, running = wait(running, return_when=FIRST_COMPLETED)
+            pending.extend(future.result() for future in finished)
+            running |= submit(len(finished))
+            del finished
+            if len(pending) >= flush_every:
+                save_results(output, pending)
+                pending = []
+    if pending:
+        save_results(output, pending)
+    return len(jobs)
+
+
+def parse_rule_sets(text):
+    # Sekwencje reguł oddzielone średnikami, reguły w sekwencji przecinkami, np. "30;110;41,69,65,190"
+    return [tuple(int(rule) for rule in rules.split(",")) for rules in text.split(";")]
+
+
+def album_rules(album_number):
+    # Jak w main(): kolejne pary cyfr numeru albumu oraz reguła 190
+    return tuple(int(album_number[i:i + 2]) for i in range(0, len(album_number), 2)) + (190,)
+
+
+def parse_ints(text):
+    return [int(value) for value in text.split(",")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Przegląd reguł automatu elementarnego w wielu procesach")
+    parser.add_argument("--rules", type=parse_rule_sets, default=[], help='np. "30;110;41,69,65,190"')
+    parser.add_argument("--all-rules", action="store_true", help="wszystkie 256 reguł elementarnych")
+    parser.add_argument("--album-number", help="dodaje sekwencję reguł z numeru albumu, np. 416965")
+    parser.add_argument("--seeds", type=int, default=10, help="liczba losowych stanów początkowych")
+    parser.add_argument("--widths", type=parse_ints, default=parse_ints("256"))
+    parser.add_argument("--boundaries", type=lambda text: text.split(","), default=["periodic", "absorbing"])
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--block-size", type=int, default=3)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--output", default="sweep_results", help="katalog z częściami wyników")
+    args = parser.parse_args()
+
+    rule_sets = list(args.rules)
+    if args.all_rules:
+        rule_sets += [(rule,) for rule in range(256)]
+    if args.album_number:
+        rule_sets.append(album_rules(args.album_number))
+    if not rule_sets:
+        parser.error("podaj --rules, --all-rules albo --album-number")
+
+    count = run_sweep(rule_sets, range(args.seeds), args.widths, args.boundaries, args.iterations, args.output,
+                      args.block_size, args.workers)
+    print(f"Zapisano {count} przebiegów w katalogu '{args.output}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,17 @@ from matplotlib.colors import ListedColormap
 from matplotlib.patches import Rectangle
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import tkinter as tk
-from game_of_life_logic import initialize_grid, game_of_life_step
+from game_of_life_logic import initialize_grid, game_of_life_step, numba_available
+from hashlife import HashLife
+
+# Linie siatki tylko dla mniejszych plansz - przy 1000x1000 tysiące linii spowalniałyby rysowanie
+GRIDLINES_MAX_SIZE = 200
+# Silniki bez krawędzi planszy - wyświetlany jest obszar widoczny w osiach, a nie tylko plansza
+INFINITE_ENGINES = ("hashlife", "sparse")
+# Silniki wymagające pakietu numba - bez niego zastępuje je wersja wektorowa albo HashLife
+NUMBA_ENGINES = ("packed", "tiled", "sparse")
+# Największy odczytywany fragment nieskończonej planszy (komórek na bok) przy mocnym oddaleniu
+VIEW_MAX_SIZE = 2000
 
 
 class GameOfLifeGUI:
@@ -17,6 +27,8 @@ class GameOfLifeGUI:
         self.grid = initialize_grid(height, width, initial_state)
         self.iteration = 0
         self.anim_running = False
+        self.engine = None
+        self.engine_name = "vectorized"
 
         # Rozmiar okna
         self.root.geometry("1440x900")  # szerokość x wysokość
@@ -24,6 +36,8 @@ class GameOfLifeGUI:
         # Ustawienia figury i osi
         self.fig, self.ax = plt.subplots(figsize=(10, 8))  # szerokość x wysokość w calach
         self.im = self.ax.imshow(self.grid, cmap=ListedColormap(["white", "black"]), animated=True)
+        # Granice osi zmienia tylko przybliżanie i przesuwanie, nie zmiana zakresu obrazu
+        self.ax.set_autoscale_on(False)
 
         # Dodanie granic siatki
         self.border = Rectangle(
@@ -66,7 +80,7 @@ class GameOfLifeGUI:
 
         # Wybór warunku brzegowego
         self.boundary_var = tk.StringVar(value="periodic")
-        boundary_options = ["periodic", "reflective"]
+        boundary_options = ["periodic", "reflective", "infinite"]
         self.boundary_menu = tk.OptionMenu(control_frame, self.boundary_var, *boundary_options)
         self.boundary_menu.config(width=10)
         tk.Label(control_frame, text="Warunek brzegowy:").grid(row=0, column=6, padx=5, pady=5)
@@ -81,6 +95,23 @@ class GameOfLifeGUI:
         self.iteration_label = tk.Label(control_frame, text=f"Iteracja: {self.iteration}", font=("Arial", 10, "italic"))
         self.iteration_label.grid(row=0, column=9, padx=10, pady=5)
 
+        # Wybór silnika: "hashlife" traktuje planszę jako okno na nieskończony świat (bez warunku brzegowego),
+        # tak jak warunek "infinite" dla pozostałych silników (rzadka plansza z fragmentów)
+        self.engine_var = tk.StringVar(value="vectorized")
+        self.engine_menu = tk.OptionMenu(control_frame, self.engine_var, "vectorized", "packed", "tiled",
+                                         "hashlife")
+        self.engine_menu.config(width=10)
+        tk.Label(control_frame, text="Silnik:").grid(row=1, column=2, padx=5, pady=5)
+        self.engine_menu.grid(row=1, column=3, padx=5, pady=5)
+
+        # Skok o zadaną liczbę pokoleń
+        self.jump_entry = tk.Entry(control_frame, width=12)
+        self.jump_entry.insert(0, "1000")
+        tk.Label(control_frame, text="Pokolenia:").grid(row=1, column=4, padx=5, pady=5)
+        self.jump_entry.grid(row=1, column=5, padx=5, pady=5)
+        self.jump_button = tk.Button(control_frame, text="Skocz", command=self.jump)
+        self.jump_button.grid(row=1, column=6, padx=5, pady=5)
+
         # Przybliżanie i przesuwanie ekranu
         self.scale_factor = 1.2
         self.press = None  # pozycja początkowa dla przesuwania
@@ -91,13 +122,82 @@ class GameOfLifeGUI:
         self.fig.canvas.mpl_connect("button_release_event", self.on_release)
         self.fig.canvas.mpl_connect("motion_notify_event", self.on_motion)
 
+    def create_engine(self):
+        engine = self.engine_var.get()
+        if engine != "hashlife" and self.boundary == "infinite":
+            engine = "sparse"
+        if engine in NUMBA_ENGINES and not numba_available():
+            engine = "hashlife" if engine == "sparse" else "vectorized"
+
+        # Silniki numba są importowane dopiero przy wyborze
+        self.engine_name = engine
+        if engine == "hashlife":
+            self.engine = HashLife().set_grid(self.grid)
+        elif engine == "sparse":
+            from sparse_life import SparseLife
+            self.engine = SparseLife().set_grid(self.grid)
+        elif engine == "packed":
+            from packed_life import PackedLife
+            self.engine = PackedLife(self.grid, self.boundary)
+        elif engine == "tiled":
+            from tiled_life import TiledLife
+            self.engine = TiledLife(self.grid, self.boundary)
+        else:
+            self.engine = None
+
+    def advance(self, generations):
+        # Dla silników nieskończonych bez odczytu planszy do self.grid - show_grid() czyta
+        # tylko obszar widoczny w osiach
+        if self.engine_name == "hashlife":
+            self.engine.jump(generations)
+        elif self.engine_name == "sparse":
+            self.engine.step(generations)
+        elif self.engine_name in ("packed", "tiled"):
+            self.grid = self.engine.step(generations).to_grid()
+        else:
+            for _ in range(generations):
+                self.grid = game_of_life_step(self.grid, self.boundary)
+        self.iteration += generations
+        text = f"Iteracja: {self.iteration}"
+        if self.engine_name == "tiled":
+            text += f" (aktywne kafelki: {100 * self.engine.active_fraction:.1f}%)"
+        elif self.engine_name == "sparse":
+            text += f" (fragmenty: {len(self.engine.keys)})"
+        self.iteration_label.config(text=text)
+        self.show_grid()
+        self.canvas.draw()
+
+    def visible_area(self):
+        # Wiersze i kolumny widoczne w osiach (komórka c zajmuje przedział [c - 0.5, c + 0.5]);
+        # przy mocnym oddaleniu odczytywany jest środek widoku o boku VIEW_MAX_SIZE
+        x0, x1 = sorted(self.ax.get_xlim())
+        y0, y1 = sorted(self.ax.get_ylim())
+        left, right = int(np.floor(x0 + 0.5)), int(np.ceil(x1 + 0.5))
+        top, bottom = int(np.floor(y0 + 0.5)), int(np.ceil(y1 + 0.5))
+        width, height = min(right - left, VIEW_MAX_SIZE), min(bottom - top, VIEW_MAX_SIZE)
+        return (top + bottom - height) // 2, (left + right - width) // 2, height, width
+
+    def show_grid(self):
+        if self.engine_name in INFINITE_ENGINES:
+            top, left, height, width = self.visible_area()
+            self.im.set_data(self.engine.window(top, left, height, width))
+        else:
+            top, left = 0, 0
+            height, width = self.grid.shape
+            self.im.set_data(self.grid)
+        self.im.set_extent((left - 0.5, left + width - 0.5, top + height - 0.5, top - 0.5))
+
+    def jump(self):
+        try:
+            generations = int(self.jump_entry.get())
+        except ValueError:
+            return
+        if generations > 0:
+            self.advance(generations)
+
     def update_frame(self):
         if self.anim_running:
-            self.grid = game_of_life_step(self.grid, self.boundary)
-            self.iteration += 1
-            self.iteration_label.config(text=f"Iteracja: {self.iteration}")
-            self.im.set_array(self.grid)
-            self.canvas.draw()
+            self.advance(1)
 
             # Odświeżaj co `interval` ms, w zależności od wartości z suwaka prędkości
             interval = self.speed_scale.get()
@@ -114,19 +214,23 @@ class GameOfLifeGUI:
         self.initial_state = self.initial_state_var.get()
         self.boundary = self.boundary_var.get()
         self.grid = initialize_grid(self.height, self.width, self.initial_state)
+        self.create_engine()
         self.iteration = 0
         self.iteration_label.config(text=f"Iteracja: {self.iteration}")
-        self.im.set_array(self.grid)
+        self.show_grid()
         self.canvas.draw()
-        self.boundary_label.config(text=f"Aktualny warunek: {self.boundary}")
+        boundary = "nieskończona plansza" if self.engine_name in INFINITE_ENGINES else self.boundary
+        self.boundary_label.config(text=f"Aktualny warunek: {boundary}")
 
     def create_gridlines(self):
+        self.ax.set_xticks([])
+        self.ax.set_yticks([])
+        if max(self.height, self.width) > GRIDLINES_MAX_SIZE:
+            return
         for x in range(self.width + 1):
             self.ax.axvline(x - 0.5, color="white", linestyle="-", linewidth=0.5)
         for y in range(self.height + 1):
             self.ax.axhline(y - 0.5, color="white", linestyle="-", linewidth=0.5)
-        self.ax.set_xticks([])
-        self.ax.set_yticks([])
 
     def zoom(self, event):
         if event.button == 'up':
@@ -148,6 +252,8 @@ class GameOfLifeGUI:
 
         self.ax.set_xlim(new_xlim)
         self.ax.set_ylim(new_ylim)
+        if self.engine_name in INFINITE_ENGINES:
+            self.show_grid()
         self.canvas.draw()
 
     def on_press(self, event):
@@ -170,6 +276,8 @@ class GameOfLifeGUI:
 
         self.ax.set_xlim([x + dx for x in xlim])
         self.ax.set_ylim([y + dy for y in ylim])
+        if self.engine_name in INFINITE_ENGINES:
+            self.show_grid()
 
         self.canvas.draw()
 
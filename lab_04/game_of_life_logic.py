@@ -1,5 +1,7 @@
 # game_of_life_logic.py
 
+import importlib.util
+
 import numpy as np
 
 def initialize_grid(height, width, initial_state="random"):
@@ -162,7 +164,47 @@ def count_neighbors(grid, x, y, boundary="periodic"):
             neighbors += grid[nx, ny]
     return neighbors
 
-def game_of_life_step(grid, boundary="periodic"):
+# Warunek brzegowy jako tryb np.pad: "reflective" w count_neighbors() zastępuje współrzędną spoza planszy
+# współrzędną samej komórki, czyli zawsze skrajnym wierszem/kolumną - to powielenie krawędzi ("edge");
+# każda inna wartość oznacza martwe komórki poza planszą
+PAD_MODES = {
+    "periodic": "wrap",
+    "reflective": "edge",
+}
+
+NEIGHBOR_OFFSETS = [(i, j) for i in range(3) for j in range(3) if (i, j) != (1, 1)]
+
+
+def pad_grid(grid, boundary="periodic"):
+    mode = PAD_MODES.get(boundary, "constant")
+    return np.pad(grid.astype(np.uint8, copy=False), 1, mode=mode)
+
+
+def neighbor_counts(padded):
+    # Suma ośmiu przesuniętych widoków planszy rozszerzonej o jedną komórkę z każdej strony
+    height, width = padded.shape[0] - 2, padded.shape[1] - 2
+    counts = np.zeros((height, width), dtype=np.uint8)
+    for i, j in NEIGHBOR_OFFSETS:
+        counts += padded[i:i + height, j:j + width]
+    return counts
+
+
+def numba_available():
+    # Silniki packed_life.py, tiled_life.py i sparse_life.py wymagają numby, pozostałe tylko NumPy
+    return importlib.util.find_spec("numba") is not None
+
+
+def game_of_life_step(grid, boundary="periodic", method="vectorized"):
+    # method: "vectorized" (plansza uint8, liczby sąsiadów z przesuniętych widoków), "packed"
+    # (64 komórki na słowo, sumatory bitowe, packed_life.py; bez numby jak "vectorized") lub "python"
+    if method == "packed" and numba_available():
+        from packed_life import PackedLife
+        return PackedLife(grid, boundary).step().to_grid()
+    if method != "python":
+        counts = neighbor_counts(pad_grid(grid, boundary))
+        alive = grid.astype(bool, copy=False)
+        return ((counts == 3) | (alive & (counts == 2))).view(np.uint8)
+
     new_grid = np.zeros(grid.shape, dtype=int)
     for x in range(grid.shape[0]):
         for y in range(grid.shape[1]):
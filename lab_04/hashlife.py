@@ -0,0 +1,236 @@
+# hashlife.py
+
+import numpy as np
+
+# Po przekroczeniu tej liczby węzłów usuwane są węzły nieosiągalne z korzenia i zapamiętane wyniki
+MAX_NODES = 1 << 21
+# Węzły do tego poziomu (16x16) są przy odczycie okna zamieniane na tablice jednym odczytem z pamięci
+ARRAY_CACHE_LEVEL = 4
+
+
+class Node:
+    # Kwadrat 2^level x 2^level komórek; poziom 0 to pojedyncza komórka. Węzły są kanoniczne
+    # (jeden obiekt dla danej zawartości), więc porównanie i skrót to porównanie tożsamości
+    __slots__ = ("level", "nw", "ne", "sw", "se", "population")
+
+    def __init__(self, level, nw, ne, sw, se, population):
+        self.level = level
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.population = population
+
+
+DEAD = Node(0, None, None, None, None, 0)
+ALIVE = Node(0, None, None, None, None, 1)
+
+
+def life_4x4_table():
+    # Dla każdego z 2^16 kwadratów 4x4 (bit 4y + x) środkowe 2x2 po jednym pokoleniu (bit 2y + x)
+    cells = (np.arange(1 << 16)[:, np.newaxis] >> np.arange(16)) & 1
+    cells = cells.reshape(-1, 4, 4)
+    result = np.zeros(1 << 16, dtype=np.uint8)
+    for y in (1, 2):
+        for x in (1, 2):
+            neighbors = cells[:, y - 1:y + 2, x - 1:x + 2].sum(axis=(1, 2)) - cells[:, y, x]
+            alive = (neighbors == 3) | ((cells[:, y, x] == 1) & (neighbors == 2))
+            result |= (alive << (2 * (y - 1) + (x - 1))).astype(np.uint8)
+    return result
+
+
+LIFE_4X4 = life_4x4_table()
+
+
+class HashLife:
+    # Nieskończona plansza (martwe komórki poza wzorem) jako kanoniczne drzewo czwórkowe z zapamiętanymi
+    # następnikami węzłów (algorytm Gospera). Komórka (x, y) = kolumna x, wiersz y, jak w initialize_grid()
+    def __init__(self, max_nodes=MAX_NODES):
+        self.max_nodes = max_nodes
+        self.nodes = {}
+        self.results = {}
+        self.empty_nodes = [DEAD]
+        self.arrays = {}
+        self.root = self.empty(3)
+        self.generation = 0
+
+    # --- budowa węzłów
+
+    def join(self, nw, ne, sw, se):
+        key = (nw, ne, sw, se)
+        node = self.nodes.get(key)
+        if node is None:
+            population = nw.population + ne.population + sw.population + se.population
+            node = Node(nw.level + 1, nw, ne, sw, se, population)
+            self.nodes[key] = node
+        return node
+
+    def empty(self, level):
+        while len(self.empty_nodes) <= level:
+            smaller = self.empty_nodes[-1]
+            self.empty_nodes.append(self.join(smaller, smaller, smaller, smaller))
+        return self.empty_nodes[level]
+
+    def expand(self, node):
+        # Ten sam wzór w węźle o poziom większym, wyśrodkowany
+        border = self.empty(node.level - 1)
+        return self.join(self.join(border, border, border, node.nw), self.join(border, border, node.ne, border),
+                         self.join(border, node.sw, border, border), self.join(node.se, border, border, border))
+
+    def center(self, node):
+        return self.join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    def crop(self, node):
+        # Zmniejsza korzeń, dopóki wszystkie żywe komórki mieszczą się w jego środkowej połowie
+        while node.level > 3 and self.center(node).population == node.population:
+            node = self.center(node)
+        return node
+
+    # --- ewolucja
+
+    def life_4x4(self, node):
+        bits = 0
+        for quadrant, (x0, y0) in ((node.nw, (0, 0)), (node.ne, (2, 0)), (node.sw, (0, 2)), (node.se, (2, 2))):
+            for cell, (x, y) in ((quadrant.nw, (0, 0)), (quadrant.ne, (1, 0)), (quadrant.sw, (0, 1)),
+                                 (quadrant.se, (1, 1))):
+                bits |= cell.population << (4 * (y0 + y) + x0 + x)
+        result = int(LIFE_4X4[bits])
+        cells = [ALIVE if result >> k & 1 else DEAD for k in range(4)]
+        return self.join(*cells)
+
+    def successor(self, node, j):
+        # Środkowa połowa węzła (poziom level - 1) po 2^j pokoleniach, j <= level - 2
+        if node.population == 0:
+            return self.empty(node.level - 1)
+        j = min(j, node.level - 2)
+        key = (node, j)
+        result = self.results.get(key)
+        if result is not None:
+            return result
+
+        if node.level == 2:
+            result = self.life_4x4(node)
+        else:
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            c00 = self.successor(nw, j)
+            c01 = self.successor(self.join(nw.ne, ne.nw, nw.se, ne.sw), j)
+            c02 = self.successor(ne, j)
+            c10 = self.successor(self.join(nw.sw, nw.se, sw.nw, sw.ne), j)
+            c11 = self.successor(self.join(nw.se, ne.sw, sw.ne, se.nw), j)
+            c12 = self.successor(self.join(ne.sw, ne.se, se.nw, se.ne), j)
+            c20 = self.successor(sw, j)
+            c21 = self.successor(self.join(sw.ne, se.nw, sw.se, se.sw), j)
+            c22 = self.successor(se, j)
+            if j < node.level - 2:
+                # Pełny krok 2^j już wykonany - wystarczy złożyć środki dziewięciu wyników
+                result = self.join(self.join(c00.se, c01.sw, c10.ne, c11.nw),
+                                   self.join(c01.se, c02.sw, c11.ne, c12.nw),
+                                   self.join(c10.se, c11.sw, c20.ne, c21.nw),
+                                   self.join(c11.se, c12.sw, c21.ne, c22.nw))
+            else:
+                # Dwa półkroki po 2^(level - 3) pokoleń
+                result = self.join(self.successor(self.join(c00, c01, c10, c11), j),
+                                   self.successor(self.join(c01, c02, c11, c12), j),
+                                   self.successor(self.join(c10, c11, c20, c21), j),
+                                   self.successor(self.join(c11, c12, c21, c22), j))
+        self.results[key] = result
+        return result
+
+    def jump(self, generations):
+        # Dokładnie generations pokoleń: po jednym skoku 2^j dla każdego ustawionego bitu liczby
+        j = 0
+        while generations >> j:
+            if generations >> j & 1:
+                root = self.crop(self.root)
+                while root.level < j + 1:
+                    root = self.expand(root)
+                # Dwa poziomy zapasu: żywe komórki nie opuszczą wyniku, nawet poruszając się z prędkością światła
+                self.root = self.successor(self.expand(self.expand(root)), j)
+                self.generation += 1 << j
+                self.collect_garbage()
+            j += 1
+        return self
+
+    def population(self):
+        return self.root.population
+
+    # --- pamięć
+
+    def collect_garbage(self):
+        # Pozostawia tylko węzły osiągalne z korzenia (i puste); zapamiętane następniki są tracone
+        if len(self.nodes) <= self.max_nodes:
+            return
+        self.results.clear()
+        self.arrays.clear()
+        live = {}
+        stack = [self.root] + self.empty_nodes[1:]
+        while stack:
+            node = stack.pop()
+            if node.level == 0:
+                continue
+            key = (node.nw, node.ne, node.sw, node.se)
+            if key not in live:
+                live[key] = node
+                stack.extend(key)
+        self.nodes = live
+
+    # --- konwersja z/do tablic
+
+    def set_grid(self, grid):
+        # Plansza z initialize_grid(); komórka grid[y, x] trafia na pozycję (x, y)
+        height, width = grid.shape
+        level = 3
+        while 1 << (level - 1) < max(height, width):
+            level += 1
+        half = 1 << (level - 1)
+        cells = np.zeros((1 << level, 1 << level), dtype=np.uint8)
+        cells[half:half + height, half:half + width] = grid
+        self.root = self.from_array(cells, level)
+        self.generation = 0
+        return self
+
+    def from_array(self, cells, level):
+        if not cells.any():
+            return self.empty(level)
+        if level == 0:
+            return ALIVE
+        half = 1 << (level - 1)
+        return self.join(self.from_array(cells[:half, :half], level - 1),
+                         self.from_array(cells[:half, half:], level - 1),
+                         self.from_array(cells[half:, :half], level - 1),
+                         self.from_array(cells[half:, half:], level - 1))
+
+    def node_array(self, node):
+        array = self.arrays.get(node)
+        if array is None:
+            if node.level == 0:
+                return np.full((1, 1), node.population, dtype=np.uint8)
+            array = np.block([[self.node_array(node.nw), self.node_array(node.ne)],
+                              [self.node_array(node.sw), self.node_array(node.se)]])
+            self.arrays[node] = array
+        return array
+
+    def window(self, top, left, height, width):
+        # Prostokąt planszy (wiersze top.., kolumny left..) jako tablica uint8 dla GUI;
+        # odczytywane są tylko niepuste węzły, które przecinają okno
+        result = np.zeros((height, width), dtype=np.uint8)
+        half = 1 << (self.root.level - 1)
+        self.fill_window(result, self.root, -half - top, -half - left)
+        return result
+
+    def fill_window(self, result, node, row, col):
+        size = 1 << node.level
+        height, width = result.shape
+        if node.population == 0 or row >= height or col >= width or row + size <= 0 or col + size <= 0:
+            return
+        if node.level <= ARRAY_CACHE_LEVEL:
+            array = self.node_array(node)
+            top, left = max(row, 0), max(col, 0)
+            bottom, right = min(row + size, height), min(col + size, width)
+            result[top:bottom, left:right] = array[top - row:bottom - row, left - col:right - col]
+            return
+        half = size >> 1
+        self.fill_window(result, node.nw, row, col)
+        self.fill_window(result, node.ne, row, col + half)
+        self.fill_window(result, node.sw, row + half, col)
+        self.fill_window(result, node.se, row + half, col + half)
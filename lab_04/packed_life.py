@@ -0,0 +1,148 @@
+# packed_life.py
+
+import numpy as np
+from numba import njit, prange
+
+WORD_BITS = 64
+ALL_ONES = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+# Warunki brzegowe jak w count_neighbors(): "periodic", "reflective" (powielenie krawędzi),
+# każda inna wartość - martwe komórki poza planszą
+PERIODIC, REFLECTIVE, DEAD = 0, 1, 2
+BOUNDARY_CODES = {
+    "periodic": PERIODIC,
+    "reflective": REFLECTIVE,
+}
+
+
+def boundary_code(boundary):
+    return BOUNDARY_CODES.get(boundary, DEAD)
+
+
+def pack_grid(grid):
+    # Komórka (y, x) to bit x % 64 słowa x // 64 wiersza y; bity za ostatnią kolumną są zerami
+    height, width = grid.shape
+    words = -(-width // WORD_BITS)
+    packed = np.zeros((height, words * 8), dtype=np.uint8)
+    packed[:, :-(-width // 8)] = np.packbits(grid.astype(np.uint8, copy=False), axis=1, bitorder="little")
+    return packed.view("<u8").astype(np.uint64)
+
+
+def unpack_grid(packed, width):
+    packed = np.ascontiguousarray(packed, dtype="<u8")
+    return np.unpackbits(packed.view(np.uint8), axis=1, bitorder="little")[:, :width]
+
+
+def last_word_mask(width):
+    used = width % WORD_BITS
+    if used == 0:
+        return ALL_ONES
+    return np.uint64((1 << used) - 1)
+
+
+@njit
+def neighbor_row(y, height, boundary):
+    # Indeks wiersza sąsiada (y może być -1 lub height) albo -1 dla martwego wiersza poza planszą
+    if 0 <= y < height:
+        return y
+    if boundary == PERIODIC:
+        return y % height
+    if boundary == REFLECTIVE:
+        return min(max(y, 0), height - 1)
+    return -1
+
+
+@njit
+def shifted(row, i, width, boundary):
+    # Słowa z sąsiadem z lewej (komórka x - 1) i z prawej (x + 1) na pozycji bitu x
+    n = len(row)
+    one = np.uint64(1)
+    last_bit = np.uint64((width - 1) % 64)
+    word = row[i]
+    if i > 0:
+        carry_left = row[i - 1] >> np.uint64(63)
+    elif boundary == PERIODIC:
+        carry_left = (row[n - 1] >> last_bit) & one
+    elif boundary == REFLECTIVE:
+        carry_left = word & one
+    else:
+        carry_left = np.uint64(0)
+    if i < n - 1:
+        carry_right = row[i + 1] << np.uint64(63)
+    elif boundary == PERIODIC:
+        carry_right = (row[0] & one) << last_bit
+    elif boundary == REFLECTIVE:
+        carry_right = ((row[n - 1] >> last_bit) & one) << last_bit
+    else:
+        carry_right = np.uint64(0)
+    return (word << one) | carry_left, (word >> one) | carry_right
+
+
+@njit
+def row_sum(row, i, width, boundary, with_center):
+    # Sumator pełny trzech sąsiadów z jednego wiersza (albo półsumator dwóch, bez komórki środkowej):
+    # bit jedności i bit dwójek, osobno dla każdej z 64 komórek słowa
+    left, right = shifted(row, i, width, boundary)
+    if not with_center:
+        return left ^ right, left & right
+    center = row[i]
+    return left ^ center ^ right, (left & center) | (left & right) | (center & right)
+
+
+@njit(parallel=True)
+def step_packed(packed, out, width, boundary, last_mask):
+    height, words = packed.shape
+    zero_row = np.zeros(words, dtype=np.uint64)
+    for y in prange(height):
+        above = neighbor_row(y - 1, height, boundary)
+        below = neighbor_row(y + 1, height, boundary)
+        row_above = packed[above] if above >= 0 else zero_row
+        row_below = packed[below] if below >= 0 else zero_row
+        row = packed[y]
+        for i in range(words):
+            ones_above, twos_above = row_sum(row_above, i, width, boundary, True)
+            ones_middle, twos_middle = row_sum(row, i, width, boundary, False)
+            ones_below, twos_below = row_sum(row_below, i, width, boundary, True)
+
+            # Liczba sąsiadów = ones + 2 * (liczba jedynek wśród czterech bitów dwójek)
+            ones = ones_above ^ ones_middle ^ ones_below
+            carry = (ones_above & ones_middle) | (ones_above & ones_below) | (ones_middle & ones_below)
+            pair_1 = twos_above ^ twos_middle
+            pair_2 = twos_below ^ carry
+            both = (twos_above & twos_middle) | (twos_below & carry)
+            # Dokładnie jeden z czterech bitów dwójek: 2 lub 3 sąsiadów
+            two_or_three = (pair_1 ^ pair_2) & ~both
+            out[y, i] = two_or_three & (ones | row[i])
+        out[y, words - 1] &= last_mask
+
+
+@njit
+def run_packed(packed, count, width, boundary, last_mask):
+    current = packed.copy()
+    following = np.empty_like(packed)
+    for _ in range(count):
+        step_packed(current, following, width, boundary, last_mask)
+        current, following = following, current
+    return current
+
+
+class PackedLife:
+    # Plansza gry w życie przechowywana jako wiersze słów uint64 (64 komórki na słowo)
+    def __init__(self, grid, boundary="periodic"):
+        self.height, self.width = grid.shape
+        self.boundary = boundary
+        self.code = boundary_code(boundary)
+        self.last_mask = last_word_mask(self.width)
+        self.packed = pack_grid(grid)
+        self.generation = 0
+
+    def step(self, count=1):
+        self.packed = run_packed(self.packed, count, self.width, self.code, self.last_mask)
+        self.generation += count
+        return self
+
+    def to_grid(self):
+        return unpack_grid(self.packed, self.width)
+
+    def population(self):
+        return int(np.unpackbits(self.packed.view(np.uint8)).sum())
@@ -0,0 +1,140 @@
+# sparse_life.py
+
+import numpy as np
+from numba import njit, prange
+
+CHUNK_SIZE = 64
+# Kierunki sąsiednich fragmentów w kolejności indeksu (dy + 1) * 3 + (dx + 1)
+DIRECTIONS = [(dy, dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1)]
+
+
+@njit(parallel=True)
+def life_chunks(data, neighbors, size):
+    # Następne pokolenie dla każdego kandydata: fragment z obwódką złożoną z krawędzi ośmiu sąsiadów
+    # (brakujący sąsiad to martwe komórki); neighbors[t, k] to indeks w data albo -1
+    result = np.zeros((len(neighbors), size, size), dtype=np.uint8)
+    for t in prange(len(neighbors)):
+        padded = np.zeros((size + 2, size + 2), dtype=np.uint8)
+        for k in range(9):
+            source = neighbors[t, k]
+            if source < 0:
+                continue
+            chunk = data[source]
+            dy, dx = k // 3 - 1, k % 3 - 1
+            if dy == 0 and dx == 0:
+                padded[1:size + 1, 1:size + 1] = chunk
+            elif dy == 0:
+                padded[1:size + 1, size + 1 if dx == 1 else 0] = chunk[:, 0 if dx == 1 else size - 1]
+            elif dx == 0:
+                padded[size + 1 if dy == 1 else 0, 1:size + 1] = chunk[0 if dy == 1 else size - 1, :]
+            else:
+                padded[size + 1 if dy == 1 else 0, size + 1 if dx == 1 else 0] = \
+                    chunk[0 if dy == 1 else size - 1, 0 if dx == 1 else size - 1]
+
+        for y in range(size):
+            for x in range(size):
+                count = (padded[y, x] + padded[y, x + 1] + padded[y, x + 2] + padded[y + 1, x]
+                         + padded[y + 1, x + 2] + padded[y + 2, x] + padded[y + 2, x + 1] + padded[y + 2, x + 2])
+                if count == 3 or (count == 2 and padded[y + 1, x + 1] == 1):
+                    result[t, y, x] = 1
+    return result
+
+
+class SparseLife:
+    # Nieograniczona plansza jako słownik fragmentów chunk_size x chunk_size przydzielanych tylko tam,
+    # gdzie są żywe komórki - pamięć zależy od zajętego obszaru, a nie od prostokąta obejmującego wzór.
+    # Komórka (x, y) = kolumna x, wiersz y, jak w initialize_grid(); fragment (y // size, x // size)
+    def __init__(self, chunk_size=CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.keys = []
+        self.index = {}
+        self.data = np.zeros((0, chunk_size, chunk_size), dtype=np.uint8)
+        self.generation = 0
+
+    def set_chunks(self, keys, data):
+        self.keys = keys
+        self.index = {key: i for i, key in enumerate(keys)}
+        self.data = data
+
+    def set_grid(self, grid, top=0, left=0):
+        size = self.chunk_size
+        rows, cols = grid.shape
+        keys, chunks = [], []
+        for chunk_y in range(top // size, -(-(top + rows) // size)):
+            for chunk_x in range(left // size, -(-(left + cols) // size)):
+                chunk = self.read_grid(grid, top, left, chunk_y, chunk_x)
+                if chunk.any():
+                    keys.append((chunk_y, chunk_x))
+                    chunks.append(chunk)
+        self.set_chunks(keys, np.array(chunks, dtype=np.uint8).reshape(-1, size, size))
+        self.generation = 0
+        return self
+
+    def read_grid(self, grid, top, left, chunk_y, chunk_x):
+        size = self.chunk_size
+        chunk = np.zeros((size, size), dtype=np.uint8)
+        y0, x0 = chunk_y * size - top, chunk_x * size - left
+        y1, x1 = min(y0 + size, grid.shape[0]), min(x0 + size, grid.shape[1])
+        cy, cx = max(y0, 0), max(x0, 0)
+        chunk[cy - y0:y1 - y0, cx - x0:x1 - x0] = grid[cy:y1, cx:x1]
+        return chunk
+
+    def candidates(self):
+        # Istniejące fragmenty oraz brakujący sąsiedzi, do których przylega krawędź lub róg z żywymi komórkami
+        data = self.data
+        edges = {
+            (-1, 0): data[:, 0, :].any(axis=1),
+            (1, 0): data[:, -1, :].any(axis=1),
+            (0, -1): data[:, :, 0].any(axis=1),
+            (0, 1): data[:, :, -1].any(axis=1),
+            (-1, -1): data[:, 0, 0] == 1,
+            (-1, 1): data[:, 0, -1] == 1,
+            (1, -1): data[:, -1, 0] == 1,
+            (1, 1): data[:, -1, -1] == 1,
+        }
+        candidates = list(self.keys)
+        seen = set(candidates)
+        for (dy, dx), active in edges.items():
+            for i in np.flatnonzero(active):
+                chunk_y, chunk_x = self.keys[i]
+                key = (chunk_y + dy, chunk_x + dx)
+                if key not in seen:
+                    seen.add(key)
+                    candidates.append(key)
+        return candidates
+
+    def step(self, count=1):
+        for _ in range(count):
+            candidates = self.candidates()
+            if not candidates:
+                # Pusta plansza pozostaje pusta
+                self.generation += 1
+                continue
+            neighbors = np.array([[self.index.get((chunk_y + dy, chunk_x + dx), -1) for dy, dx in DIRECTIONS]
+                                  for chunk_y, chunk_x in candidates], dtype=np.int64).reshape(-1, 9)
+            result = life_chunks(self.data, neighbors, self.chunk_size)
+            # Fragmenty, w których nie została żadna żywa komórka, są zwalniane
+            alive = result.reshape(len(candidates), -1).any(axis=1)
+            self.set_chunks([key for key, keep in zip(candidates, alive) if keep], result[alive])
+            self.generation += 1
+        return self
+
+    def population(self):
+        return int(self.data.sum())
+
+    def memory_bytes(self):
+        return self.data.nbytes
+
+    def window(self, top, left, height, width):
+        # Prostokąt planszy (wiersze top.., kolumny left..) jako tablica uint8; odczytywane są tylko
+        # istniejące fragmenty, które go przecinają
+        size = self.chunk_size
+        result = np.zeros((height, width), dtype=np.uint8)
+        for (chunk_y, chunk_x), chunk in zip(self.keys, self.data):
+            y0, x0 = chunk_y * size - top, chunk_x * size - left
+            if y0 >= height or x0 >= width or y0 + size <= 0 or x0 + size <= 0:
+                continue
+            cy, cx = max(y0, 0), max(x0, 0)
+            y1, x1 = min(y0 + size, height), min(x0 + size, width)
+            result[cy:y1, cx:x1] = chunk[cy - y0:y1 - y0, cx - x0:x1 - x0]
+        return result
@@ -0,0 +1,36 @@
+import numpy as np
+
+from game_of_life_logic import game_of_life_step, initialize_grid
+from sparse_life import SparseLife
+
+
+def test_step_empty_board():
+    life = SparseLife().step(3)
+    assert life.population() == 0
+    assert life.generation == 3
+    assert not life.window(-10, -10, 20, 20).any()
+
+    cleared = SparseLife().set_grid(np.zeros((30, 30), dtype=np.uint8)).step()
+    assert cleared.population() == 0
+
+
+def test_step_after_pattern_dies_out():
+    grid = np.zeros((5, 5), dtype=np.uint8)
+    grid[2, 2] = 1
+    life = SparseLife(8).set_grid(grid).step()
+    assert life.population() == 0
+    assert life.keys == []
+    life.step(2)
+    assert life.population() == 0
+    assert life.generation == 3
+
+
+def test_matches_dead_boundary_step():
+    grid = initialize_grid(40, 40, "acorn")
+    board = np.zeros((240, 240), dtype=np.uint8)
+    board[100:140, 100:140] = grid
+    life = SparseLife(16).set_grid(grid)
+    for _ in range(60):
+        board = game_of_life_step(board, "dead")
+    life.step(60)
+    assert np.array_equal(life.window(-100, -100, 240, 240), board)
@@ -0,0 +1,108 @@
+# tiled_life.py
+
+import numpy as np
+from numba import njit, prange
+
+TILE_SIZE = 32
+
+
+@njit(parallel=True)
+def compute_tiles(board, tiles, tile_size, height, width, scratch, changed):
+    # Nowe wartości aktywnych kafelków liczone z planszy z obwódką (board[y + 1, x + 1] to komórka (y, x));
+    # plansza jest tylko czytana, więc kafelki mogą być liczone równolegle
+    for t in prange(len(tiles)):
+        y0 = tiles[t, 0] * tile_size
+        x0 = tiles[t, 1] * tile_size
+        y1 = min(y0 + tile_size, height)
+        x1 = min(x0 + tile_size, width)
+        any_change = False
+        for y in range(y0, y1):
+            for x in range(x0, x1):
+                count = (board[y, x] + board[y, x + 1] + board[y, x + 2] + board[y + 1, x] + board[y + 1, x + 2]
+                         + board[y + 2, x] + board[y + 2, x + 1] + board[y + 2, x + 2])
+                alive = board[y + 1, x + 1]
+                new = 1 if count == 3 or (alive == 1 and count == 2) else 0
+                scratch[t, y - y0, x - x0] = new
+                if new != alive:
+                    any_change = True
+        changed[t] = any_change
+
+
+@njit
+def write_tiles(board, tiles, tile_size, height, width, scratch, changed):
+    for t in range(len(tiles)):
+        if not changed[t]:
+            continue
+        y0 = tiles[t, 0] * tile_size
+        x0 = tiles[t, 1] * tile_size
+        y1 = min(y0 + tile_size, height)
+        x1 = min(x0 + tile_size, width)
+        board[y0 + 1:y1 + 1, x0 + 1:x1 + 1] = scratch[t, :y1 - y0, :x1 - x0]
+
+
+def refresh_halo(board, boundary):
+    # Obwódka jak w count_neighbors(): kopia przeciwległej krawędzi (periodic), tej samej krawędzi
+    # (reflective) albo zera (martwe komórki) - koszt proporcjonalny do obwodu, nie do pola planszy
+    if boundary == "periodic":
+        board[0, 1:-1] = board[-2, 1:-1]
+        board[-1, 1:-1] = board[1, 1:-1]
+        board[:, 0] = board[:, -2]
+        board[:, -1] = board[:, 1]
+    elif boundary == "reflective":
+        board[0, 1:-1] = board[1, 1:-1]
+        board[-1, 1:-1] = board[-2, 1:-1]
+        board[:, 0] = board[:, 1]
+        board[:, -1] = board[:, -2]
+
+
+def dilate_tiles(changed, periodic):
+    # Komórka może się zmienić tylko wtedy, gdy w poprzednim kroku zmienił się ktoś z jej sąsiedztwa 3x3,
+    # więc do przeliczenia są kafelki zmienione i ich sąsiedzi (przez krawędź tylko dla periodic)
+    if periodic:
+        rows = changed | np.roll(changed, 1, axis=0) | np.roll(changed, -1, axis=0)
+        return rows | np.roll(rows, 1, axis=1) | np.roll(rows, -1, axis=1)
+    padded = np.pad(changed, 1)
+    rows = padded[:-2] | padded[1:-1] | padded[2:]
+    return rows[:, :-2] | rows[:, 1:-1] | rows[:, 2:]
+
+
+class TiledLife:
+    # Gra w życie liczona tylko w kafelkach tile_size x tile_size, w których lub obok których coś
+    # zmieniło się w poprzednim pokoleniu; niezmienne i puste obszary nic nie kosztują
+    def __init__(self, grid, boundary="periodic", tile_size=TILE_SIZE):
+        self.height, self.width = grid.shape
+        self.boundary = boundary
+        self.tile_size = tile_size
+        self.board = np.zeros((self.height + 2, self.width + 2), dtype=np.uint8)
+        self.board[1:-1, 1:-1] = grid
+        refresh_halo(self.board, boundary)
+        tiles_shape = (-(-self.height // tile_size), -(-self.width // tile_size))
+        self.changed = np.ones(tiles_shape, dtype=bool)
+        self.scratch = np.empty((0, tile_size, tile_size), dtype=np.uint8)
+        self.generation = 0
+        # Udział przeliczanych kafelków w kolejnych pokoleniach
+        self.active_history = []
+
+    def step(self, count=1):
+        for _ in range(count):
+            active = dilate_tiles(self.changed, self.boundary == "periodic")
+            tiles = np.argwhere(active)
+            if len(self.scratch) < len(tiles):
+                self.scratch = np.empty((len(tiles), self.tile_size, self.tile_size), dtype=np.uint8)
+            changed = np.zeros(len(tiles), dtype=np.bool_)
+            compute_tiles(self.board, tiles, self.tile_size, self.height, self.width, self.scratch, changed)
+            write_tiles(self.board, tiles, self.tile_size, self.height, self.width, self.scratch, changed)
+            refresh_halo(self.board, self.boundary)
+
+            self.changed[:] = False
+            self.changed[tiles[changed, 0], tiles[changed, 1]] = True
+            self.active_history.append(len(tiles) / active.size)
+            self.generation += 1
+        return self
+
+    @property
+    def active_fraction(self):
+        return self.active_history[-1] if self.active_history else 1.0
+
+    def to_grid(self):
+        return self.board[1:-1, 1:-1].copy()